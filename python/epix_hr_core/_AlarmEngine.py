@@ -0,0 +1,192 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import numpy     as np
+import threading
+import time
+
+##############################################################
+##
+## Threshold, rate of change and hysteresis alarms
+##
+## All limits and states are (numBoards, numChannels) arrays,
+## a batch of samples is evaluated in one numpy pass. Bool
+## status bits (Lol, Los, LockedN) are handled as channels
+## with high=0.5 (alarm on 1) or low=0.5 (alarm on 0).
+##
+##############################################################
+class AlarmEngine(pr.Device):
+    def __init__(self, channelNames, numBoards=1, **kwargs):
+        super().__init__(description='Vectorized alarm engine', **kwargs)
+
+        self.channelNames = list(channelNames)
+        self.numBoards    = numBoards
+        shape = (numBoards, len(self.channelNames))
+
+        self._low     = np.full(shape, -np.inf)
+        self._high    = np.full(shape, np.inf)
+        self._rate    = np.full(shape, np.inf)
+        self._hyst    = np.zeros(shape)
+        self._protect = np.zeros(shape, dtype=bool)
+        self._active  = np.zeros(shape, dtype=bool)
+        self._value   = np.full(shape, np.nan)
+        self._time    = np.full(numBoards, np.nan)
+        self._lock    = threading.Lock()
+
+        self._listeners = []
+        self._actions   = {}
+
+        self.add(pr.LocalVariable(name='Enable',            description='Evaluate incoming samples',         mode='RW', value=True))
+        self.add(pr.LocalVariable(name='ActiveAlarms',      description='Number of active alarms',           mode='RO', value=0, disp='{}'))
+        self.add(pr.LocalVariable(name='AlarmCount',        description='Alarm transitions since clear',     mode='RO', value=0, disp='{}'))
+        self.add(pr.LocalVariable(name='LastAlarm',         description='Last alarm raised',                 mode='RO', value=''))
+        self.add(pr.LocalVariable(name='ProtectionTripped', description='A protective action has been taken', mode='RO', value=False))
+
+        self.add(pr.LocalCommand(name='ClearAlarms', description='Clear the alarm states and counters', function=lambda: self.clear()))
+
+    def _index(self, channel):
+        return channel if isinstance(channel, int) else self.channelNames.index(channel)
+
+    def setLimits(self, channel, low=None, high=None, rate=None, hysteresis=None, protect=None, board=None):
+        """Set the limits of a channel (name or index) on one board, all boards when board is None
+
+        rate is the maximum absolute rate of change in units per second. An alarm
+        clears once the value is back inside the limits by more than hysteresis.
+        """
+        b = slice(None) if board is None else board
+        c = self._index(channel)
+        with self._lock:
+            if low is not None:
+                self._low[b, c] = low
+            if high is not None:
+                self._high[b, c] = high
+            if rate is not None:
+                self._rate[b, c] = rate
+            if hysteresis is not None:
+                self._hyst[b, c] = hysteresis
+            if protect is not None:
+                self._protect[b, c] = protect
+
+    def addListener(self, func):
+        """Register func(board, channel, active, value, timestamp), called on each alarm transition"""
+        self._listeners.append(func)
+
+    def addProtectiveAction(self, board, func):
+        """Register func() called when a protect channel of board raises an alarm"""
+        self._actions.setdefault(board, []).append(func)
+
+    @staticmethod
+    def powerOffAction(psDev):
+        """Protective action turning off the asic supplies of a powerSupplyRegisters device"""
+        def func():
+            psDev.DigitalEn.set(False, write=False)
+            psDev.AnalogEn.set(False, write=False)
+            psDev.writeBlocks()
+            psDev.checkBlocks()
+        return func
+
+    def clear(self):
+        with self._lock:
+            self._active.fill(False)
+        self.ActiveAlarms.set(0, write=False)
+        self.AlarmCount.set(0, write=False)
+        self.LastAlarm.set('', write=False)
+        self.ProtectionTripped.set(False, write=False)
+
+    def slowAdcListener(self, board):
+        """Return a SlowAdcReceiver listener feeding the batches of board into the engine"""
+        def func(batch):
+            names = [name for name in self.channelNames if name in batch.dtype.names]
+            values = np.full((len(batch), len(self.channelNames)), np.nan)
+            for name in names:
+                values[:, self.channelNames.index(name)] = batch[name]
+            self.evaluate(values, batch['timestamp'], board=board)
+        return func
+
+    def evaluate(self, values, timestamps=None, board=None):
+        """Evaluate a batch of samples and return the resulting alarm states
+
+        values is (numBoards, numChannels) or (nSamples, numBoards, numChannels), or
+        without the board axis when board is given. NaN samples leave the state unchanged.
+        """
+        if not self.Enable.value():
+            return self._active.copy()
+
+        values = np.asarray(values, dtype=np.float64)
+        b = slice(None) if board is None else slice(board, board + 1)
+        if board is not None:
+            values = values[..., np.newaxis, :]
+        if values.ndim == 2:
+            values = values[np.newaxis]
+        n = values.shape[0]
+        if timestamps is None:
+            timestamps = np.full(n, time.time())
+        timestamps = np.asarray(timestamps, dtype=np.float64).reshape(n)
+
+        with self._lock:
+            low, high, hyst = self._low[b], self._high[b], self._hyst[b]
+            prevActive = self._active[b].copy()
+
+            # Rate of change against the previous sample of the same channel
+            prevV = np.concatenate((self._value[b][np.newaxis], values[:-1]))
+            prevT = np.concatenate((self._time[b][np.newaxis], np.broadcast_to(timestamps[:-1, np.newaxis], (n - 1, values.shape[1]))))
+            dt = timestamps[:, np.newaxis, np.newaxis] - prevT[..., np.newaxis]
+            with np.errstate(invalid='ignore', divide='ignore'):
+                rate = np.abs(values - prevV) / dt
+            rateBad = np.nan_to_num(rate, nan=0.0, posinf=np.inf) > self._rate[b]
+
+            # Hysteresis latch: raise outside the limits, clear inside the limits by hyst,
+            # otherwise hold. The state at each sample is set by the last raise or clear.
+            valid = ~np.isnan(values)
+            raise_ = valid & ((values < low) | (values > high) | rateBad)
+            clear  = valid & ~raise_ & (values >= low + hyst) & (values <= high - hyst)
+            event  = raise_ | clear
+            idx    = np.where(event, np.arange(n)[:, np.newaxis, np.newaxis], -1)
+            last   = np.maximum.accumulate(idx, axis=0)
+            state  = np.where(last >= 0, np.take_along_axis(raise_, np.maximum(last, 0), axis=0), prevActive)
+
+            self._active[b] = state[-1]
+            lastValid = np.maximum.accumulate(np.where(valid, np.arange(n)[:, np.newaxis, np.newaxis], -1), axis=0)[-1]
+            hasValid  = lastValid >= 0
+            self._value[b] = np.where(hasValid, np.take_along_axis(values, np.maximum(lastValid, 0)[np.newaxis], axis=0)[0], self._value[b])
+            self._time[b] = timestamps[-1]
+
+            # Transitions are rare, only they are handled in python
+            before = np.concatenate((prevActive[np.newaxis], state[:-1]))
+            changes = np.argwhere(state != before)
+            protect = self._protect[b]
+            active = self._active.copy()
+
+        boardOffset = 0 if board is None else board
+        tripped = set()
+        for s, bi, ci in changes:
+            isActive = bool(state[s, bi, ci])
+            brd = int(bi) + boardOffset
+            for func in self._listeners:
+                func(brd, self.channelNames[ci], isActive, float(values[s, bi, ci]), float(timestamps[s]))
+            if isActive:
+                with self.AlarmCount.lock:
+                    self.AlarmCount.set(self.AlarmCount.value() + 1, write=False)
+                self.LastAlarm.set(f'board {brd} {self.channelNames[ci]} = {values[s, bi, ci]:0.3f}', write=False)
+                if protect[bi, ci]:
+                    tripped.add(brd)
+
+        for brd in tripped:
+            for func in self._actions.get(brd, []):
+                func()
+            self.ProtectionTripped.set(True, write=False)
+
+        self.ActiveAlarms.set(int(np.count_nonzero(active)), write=False)
+        return active
+
+    def getActive(self):
+        """Return the (numBoards, numChannels) alarm state"""
+        with self._lock:
+            return self._active.copy()
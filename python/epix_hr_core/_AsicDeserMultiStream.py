@@ -0,0 +1,247 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue      as pr
+import epix_hr_core as epixHrCore
+import numpy        as np
+import time
+import os
+
+##############################################################
+##
+## Common register map of the multi stream 20 bit deserializers
+##
+## Per channel state is available both as numbered scalars
+## (Delay0, LockErrors0, ...) and as array variables covering
+## the whole register range (Delays, LockErrors, Locked,
+## IserdeseOut, BERTCounters), one transaction per access.
+##
+##############################################################
+class AsicDeserMultiStream(pr.Device):
+    IDLE_PATTERN1 = 0xAAA83
+    IDLE_PATTERN2 = 0xAA97C
+
+    def __init__(self, numStreams, delayReload=False, compactDebug=False, **kwargs):
+        super().__init__(**kwargs)
+
+        # Creation. memBase is either the register bus server (srp, rce mapped memory, etc) or the device which
+        # contains this object. In most cases the parent and memBase are the same but they can be
+        # different in more complex bus structures. They will also be different for the top most node.
+        # The setMemBase call can be used to update the memBase for this Device. All sub-devices and local
+        # blocks will be updated.
+
+        # delayReload: write the delay a second time without the load bit (bit 9)
+        # compactDebug: no per channel IserdeseOut/BERTCounter scalars and tenbData_ser devices,
+        #               use the array variables and getTenbData() instead
+        self._numStreams  = numStreams
+        self._delayReload = delayReload
+
+        #############################################
+        # Create block / variable combinations
+        #############################################
+
+
+        #Setup registers & variables
+        self.add(pr.RemoteVariable(name='StreamsEn_n',  description='Enable/Disable', offset=0x00000000, bitSize=numStreams,  bitOffset=0,  base=pr.UInt, mode='RW'))
+        self.add(pr.RemoteVariable(name=('IdelayRst'),     description='iDelay reset',  offset=0x00000008, bitSize=numStreams, bitOffset=0, base=pr.UInt,  disp = '{:#x}', mode='RW'))
+        self.add(pr.RemoteVariable(name=('IserdeseRst'),   description='iSerdese3 reset',  offset=0x0000000C, bitSize=numStreams, bitOffset=0, base=pr.UInt,  disp = '{:#x}', mode='RW'))
+        self.add(pr.RemoteVariable(name='Resync',       description='Resync',         offset=0x00000004, bitSize=1,  bitOffset=0,  base=pr.Bool, verify = False, mode='RW'))
+
+        for i in range(0, numStreams):
+            self.add(pr.RemoteVariable(name=('Delay%d_'%i), description='Data ADC Idelay3 value', offset=0x00000010+i*4, bitSize=10,  bitOffset=0,  base=pr.UInt, disp = '{}', verify=False, mode='RW', hidden=True, overlapEn=True))
+            self.add(pr.LinkVariable(  name=('Delay%d'%i),  description='Data ADC Idelay3 value', linkedGet=self.getDelay, linkedSet=self.setDelay, dependencies=[self.variables['Delay%d_'%i]]))
+
+        self.add(pr.RemoteVariable(name='Delays_', description='Data ADC Idelay3 values', offset=0x00000010, numValues=numStreams, valueBits=10, valueStride=32, base=pr.UInt, verify=False, mode='RW', hidden=True, overlapEn=True))
+        self.add(pr.LinkVariable(  name='Delays',  description='Data ADC Idelay3 values', linkedGet=self.getDelay, linkedSet=self.setDelay, dependencies=[self.Delays_]))
+
+        for i in range(0, numStreams):
+            self.add(pr.RemoteVariable(name=('LockErrors%d'%i),  description='LockErrors',     offset=0x00000100+i*4, bitSize=16, bitOffset=0,  base=pr.UInt, disp = '{}', mode='RO', overlapEn=True))
+            self.add(pr.RemoteVariable(name=('Locked%d'%i),      description='Locked',         offset=0x00000100+i*4, bitSize=1,  bitOffset=16, base=pr.Bool, mode='RO', overlapEn=True))
+
+        self.add(pr.RemoteVariable(name='LockErrors', description='LockErrors of all channels', offset=0x00000100, numValues=numStreams, valueBits=16, valueStride=32, bitOffset=0,  base=pr.UInt, mode='RO', overlapEn=True, hidden=True))
+        self.add(pr.RemoteVariable(name='Locked',     description='Locked of all channels',     offset=0x00000100, numValues=numStreams, valueBits=1,  valueStride=32, bitOffset=16, base=pr.UInt, mode='RO', overlapEn=True, hidden=True))
+
+        self.add(pr.RemoteVariable(name='IserdeseOut',   description='IserdeseOut, index 2*channel+word', offset=0x00000300, numValues=2*numStreams, valueBits=20, valueStride=32, base=pr.UInt, mode='RO', overlapEn=True, hidden=True))
+        if not compactDebug:
+            for j in range(0, numStreams):
+                for i in range(0, 2):
+                    self.add(pr.RemoteVariable(name=('IserdeseOut%d_%d' % (j, i)),   description='IserdeseOut'+str(i),  offset=0x00000300+i*4+j*8, bitSize=20, bitOffset=0, base=pr.UInt,  disp = '{:#x}', mode='RO', overlapEn=True))
+
+        self.add(pr.RemoteVariable(name='FreezeDebug',      description='Restart BERT',  offset=0x00000400, bitSize=1,  bitOffset=0, base=pr.Bool, mode='RW'))
+        self.add(pr.RemoteVariable(name='BERTRst',      description='Restart BERT',      offset=0x00000400, bitSize=1,  bitOffset=1, base=pr.Bool, mode='RW'))
+
+        self.add(pr.RemoteVariable(name='BERTCounters', description='Counter values', offset=0x00000404, numValues=numStreams, valueBits=44, valueStride=64, base=pr.UInt, mode='RO', overlapEn=True, hidden=True))
+        if not compactDebug:
+            for i in range(0, numStreams):
+                self.add(pr.RemoteVariable(name='BERTCounter'+str(i),   description='Counter value.'+str(i),  offset=0x00000404+i*8, bitSize=44, bitOffset=0, base=pr.UInt,  disp = '{}', mode='RO', overlapEn=True))
+
+            for i in range(0, numStreams):
+                self.add(epixHrCore.AsicDeser10bDataRegisters(name='tenbData_ser%d'%i,      offset=(0x00000500+(i*0x00000100)), expand=False))
+
+        self.add(pr.LocalVariable(name='CheckpointDir', description='Directory for resumable delay sweep checkpoints, empty to disable', mode='RW', value=''))
+
+        #####################################
+        # Create commands
+        #####################################
+
+        # A command has an associated function. The function can be a series of
+        # python commands in a string. Function calls are executed in the command scope
+        # the passed arg is available as 'arg'. Use 'dev' to get to device scope.
+        # A command can also be a call to a local function with local scope.
+        # The command object and the arg are passed
+
+        self.add(pr.LocalCommand(name='InitAdcDelay',description='Find and set best delay for the adc channels', function=self.fnSetFindAndSetDelays))
+        self.add(pr.LocalCommand(name='InitAdcDelayConf',description='[skewPct, pattern1, pattern2, noReSync]', value=[50,0,0,0], function=self.fnSetFindAndSetDelaysConf))
+        self.add(pr.LocalCommand(name='Refines delay settings',description='Find and set best delay for the adc channels', function=self.fnRefineDelays))
+
+    def fnSetFindAndSetDelaysConf(self,dev,cmd,arg):
+        """Find and set Monitoring ADC delays"""
+        arguments = np.asarray(arg)
+        if arguments[1] == 0 and arguments[2] == 0:
+            self.IDLE_PATTERN1 = 0xAAA83
+            self.IDLE_PATTERN2 = 0xAA97C
+        else:
+            self.IDLE_PATTERN1 = arguments[1]
+            self.IDLE_PATTERN2 = arguments[2]
+        eyeFactor = arguments[0]/100
+        noReSync = arguments[3]
+
+        print("Executing delay test for ePixHr. Eye delay skew %f, pattern1 %X, pattern2 %X, do re-sync %d"%(eyeFactor, self.IDLE_PATTERN1, self.IDLE_PATTERN2, not noReSync))
+        self._findAndSetDelays(eyeFactor, noReSync == 0)
+
+    def fnSetFindAndSetDelays(self,dev,cmd,arg):
+        """Find and set Monitoring ADC delays"""
+        self.IDLE_PATTERN1 = 0xAAA83
+        self.IDLE_PATTERN2 = 0xAA97C
+        print("Executing delay test for ePixHr")
+        self._findAndSetDelays(0.5, True)
+
+    def _findAndSetDelays(self, eyeFactor, resync):
+        numDelayTaps = 512
+        self._scanDelays(numDelayTaps, resync=resync, checks=1, settle=False, tag='InitAdcDelay')
+        self._printScan()
+        np.savetxt(str(self.name)+'_delayTestResultAll.csv', (self.testResult*self.testDelay), delimiter=',')
+
+        self._suggestDelays(self.testResult, eyeFactor)
+        self.Delays.set(self.sugDelays)
+        if resync:
+            self.Resync.set(True)
+            time.sleep(1.0 / float(100))
+            self.Resync.set(False)
+
+    def fnRefineDelays(self,dev,cmd,arg):
+        """Find and set Monitoring ADC delays"""
+        numDelayTaps = 512
+        self.IDLE_PATTERN1 = 0xAAA83
+        self.IDLE_PATTERN2 = 0xAA97C
+        print("Executing delay test for ePixHr")
+
+        # Ten IserdeseOut samples per tap, no resync
+        self._scanDelays(numDelayTaps, resync=False, checks=10, settle=True, tag='RefineDelays')
+        self._printScan()
+        np.savetxt(str(self.name)+'_delayRefineTestResultAll.csv', (self.testResult), delimiter=',')
+
+        self._suggestDelays(self.testResult != 0, 0.5)
+        self.Delays.set(self.sugDelays)
+
+    def _scanDelays(self, numDelayTaps, resync, checks, settle, tag='scan'):
+        # All channels step together: one block write and one block read per tap
+        n = self._numStreams
+
+        # With CheckpointDir set every tap is saved and an interrupted sweep resumes
+        ckDir = self.CheckpointDir.value()
+        if ckDir:
+            meta = {'numDelayTaps': numDelayTaps, 'resync': bool(resync), 'checks': checks, 'settle': bool(settle),
+                    'patterns': [int(self.IDLE_PATTERN1), int(self.IDLE_PATTERN2)]}
+            ck = epixHrCore.SweepCheckpoint(os.path.join(ckDir, f'{self.path}_{tag}'), ['testResult', 'testDelay'], (n, numDelayTaps), meta)
+            self.testResult, self.testDelay = ck['testResult'], ck['testDelay']
+            if ck.done:
+                print(f'{self.path}: resuming {tag} sweep, {len(ck.done)} of {numDelayTaps} taps done')
+        else:
+            ck = None
+            self.testResult = np.zeros((n, numDelayTaps))
+            self.testDelay  = np.zeros((n, numDelayTaps))
+
+        complete = False
+        try:
+            for delay in range(0, numDelayTaps):
+                if ck is not None and delay in ck.done:
+                    continue
+                self.Delays.set(np.full(n, delay))
+                if settle:
+                    time.sleep(1.0 / float(100))
+                self.testDelay[:,delay] = self.Delays.get()
+                if resync:
+                    self.Resync.set(True)
+                    self.Resync.set(False)
+                time.sleep(1.0 / float(100))
+
+                # A tap interrupted before its journal entry may hold partial counts
+                self.testResult[:,delay] = 0
+                for check in range(0, checks):
+                    self.testResult[:,delay] += self._idleMatch(self.getIserdeseOut()[:,0])
+                if ck is not None:
+                    ck.mark(delay)
+
+            # Completed sweep: keep the results in memory, drop the checkpoint
+            if ck is not None:
+                self.testResult, self.testDelay = np.array(self.testResult), np.array(self.testDelay)
+            complete = True
+        finally:
+            if ck is not None:
+                ck.close()
+                if complete:
+                    ck.remove()
+
+    def _printScan(self):
+        for i in range(0, self._numStreams):
+            print("Test result adc %d:"%i)
+            print(self.testResult[i,:]*self.testDelay[i,:])
+
+    def _suggestDelays(self, hits, eyeFactor):
+        # Length of the run of good taps ending at each tap (tap 0 never counts), the suggested
+        # delay is the end of the longest run moved back by eyeFactor of its length
+        self.sugDelays, self.resultArray = self._eyeCenters(hits, eyeFactor)
+        for i, sug in enumerate(self.sugDelays):
+            setattr(self, 'sugDelay%d'%i, int(sug))
+            print("Suggested delay_%d: %d" % (i, sug))
+
+    @staticmethod
+    def _eyeCenters(hits, eyeFactor):
+        """Suggested delay and good run lengths for a (channels, taps) hit matrix"""
+        v = np.array(hits, dtype=np.float64)
+        v[:,0] = 0
+        c = np.cumsum(v, axis=1)
+        runs = c - np.maximum.accumulate(np.where(v == 0, c, 0), axis=1)
+        longest = np.argmax(runs, axis=1)
+        return longest - (runs[np.arange(len(runs)), longest]*eyeFactor).astype(int), runs
+
+    def _idleMatch(self, values):
+        return (values == self.IDLE_PATTERN1) | (values == self.IDLE_PATTERN2)
+
+    def getIserdeseOut(self):
+        """Read all the IserdeseOut words in one block, shape (numStreams, 2)"""
+        return np.asarray(self.IserdeseOut.get(), dtype=np.uint32).reshape(self._numStreams, 2)
+
+    def getBertCounters(self):
+        """Read all the BERT counters in one block"""
+        return np.asarray(self.BERTCounters.get(), dtype=np.uint64)
+
+    def getTenbData(self, ch):
+        """On demand read of the two 10 bit samples of channel ch (no tree nodes needed)"""
+        return [w & 0x3FF for w in self._rawRead(0x00000500 + ch*0x100, 2)]
+
+    def setDelay(self, var, value, write):
+        # Scalar or array, the load bit (bit 9) is set with the new value
+        var.dependencies[0].set(np.asarray(value) + 512 if var is self.Delays else value + 512, write)
+        if self._delayReload:
+            var.dependencies[0].set(value, write)
+
+    def getDelay(self, var, read):
+        return var.dependencies[0].get(read)
@@ -0,0 +1,116 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue     as pr
+
+##############################################################
+##
+## Base device for DAC driven voltage rails
+##
+## Each rail is a numeric LinkVariable in volts with a reverse
+## setter:  volts = code * voltsPerCode * <rail>Gain + <rail>Offset
+## The gain and offset are LocalVariables so the per board
+## calibration is saved and loaded with the configuration.
+##
+## When the DAC words are contiguous, setRailArray() registers
+## an overlapping array variable over them: getVoltages() and
+## setVoltages() then access all rails in one block transaction.
+##
+##############################################################
+class CalibratedRailDevice(pr.Device):
+    def __init__(self, calibration=None, **kwargs):
+        super().__init__(**kwargs)
+        self._rails = {}
+        self._railArray = None
+        self._calibration = calibration if calibration is not None else {}
+
+    def addRail(self, name, dacVar, voltsPerCode, maxCode=65535, readOnly=False, calibrationOf=None, **kwargs):
+        """Add the volts LinkVariable name for the code variable dacVar
+
+        calibrationOf shares the gain and offset of an existing rail (e.g. for a readback).
+        """
+        calName = name if calibrationOf is None else calibrationOf
+        if calibrationOf is None:
+            gain, offset = self._calibration.get(name, (1.0, 0.0))
+            self.add((
+                pr.LocalVariable(name=f'{name}Gain',   description=f'{name} calibration gain',       mode='RW', value=float(gain),   hidden=True),
+                pr.LocalVariable(name=f'{name}Offset', description=f'{name} calibration offset (V)', mode='RW', value=float(offset), hidden=True, units='V')))
+        self._rails[name] = (dacVar, voltsPerCode, maxCode, self.variables[f'{calName}Gain'], self.variables[f'{calName}Offset'])
+
+        self.add(pr.LinkVariable(
+            name         = name,
+            units        = 'V',
+            disp         = '{:1.3f}',
+            linkedGet    = self._railGet,
+            linkedSet    = None if readOnly else self._railSet,
+            dependencies = [dacVar, self.variables[f'{calName}Gain'], self.variables[f'{calName}Offset']],
+            **kwargs))
+
+    def _toVolts(self, name, code):
+        dacVar, voltsPerCode, maxCode, gain, offset = self._rails[name]
+        return float(code) * voltsPerCode * gain.value() + offset.value()
+
+    def _toCode(self, name, volts):
+        dacVar, voltsPerCode, maxCode, gain, offset = self._rails[name]
+        code = int(round((volts - offset.value()) / (gain.value() * voltsPerCode)))
+        if not 0 <= code <= maxCode:
+            raise ValueError(f'{self.path}.{name}: {volts} V is outside the DAC range ({self._toVolts(name, 0):0.3f} V to {self._toVolts(name, maxCode):0.3f} V)')
+        return code
+
+    def _railGet(self, var, read):
+        return self._toVolts(var.name, var.dependencies[0].get(read=read))
+
+    def _railSet(self, var, value, write):
+        var.dependencies[0].set(value=self._toCode(var.name, value), write=write)
+
+    def setCalibration(self, name, gain=1.0, offset=0.0):
+        self.variables[f'{name}Gain'].set(float(gain))
+        self.variables[f'{name}Offset'].set(float(offset))
+
+    def setRailArray(self, arrayVar, names):
+        """Batch rail access through arrayVar, an overlapEn array variable over the DAC words of names (in order)"""
+        self._railArray = (arrayVar, {name: i for i, name in enumerate(names)})
+
+    def getVoltages(self, read=True):
+        """Return {rail: volts} for all rails, reading the DAC registers in one block transaction"""
+        if self._railArray is not None:
+            arrayVar, index = self._railArray
+            codes = arrayVar.get(read=read)
+            return {name: self._toVolts(name, codes[index[name]]) if name in index else self._toVolts(name, rail[0].get(read=read))
+                    for name, rail in self._rails.items()}
+
+        dacVars = [rail[0] for rail in self._rails.values()]
+        if read:
+            self.readBlocks(variable=dacVars)
+            self.checkBlocks(variable=dacVars)
+        return {name: self._toVolts(name, rail[0].value()) for name, rail in self._rails.items()}
+
+    def setVoltages(self, volts):
+        """Set several rails from {rail: volts}
+
+        With a rail array all the DAC words are written in one block transaction and verified
+        with one read, the rails not given are rewritten with their current shadow value.
+        """
+        codes = {name: self._toCode(name, v) for name, v in volts.items()}
+        if self._railArray is not None and all(name in self._railArray[1] for name in codes):
+            arrayVar, index = self._railArray
+            words = [int(c) for c in arrayVar.value()]
+            for name, code in codes.items():
+                words[index[name]] = code
+            arrayVar.set(words)
+            return
+
+        dacVars = []
+        for name, code in codes.items():
+            dacVar = self._rails[name][0]
+            dacVar.set(code, write=False)
+            dacVars.append(dacVar)
+        self.writeBlocks(variable=dacVars)
+        self.verifyBlocks(variable=dacVars)
+        self.checkBlocks(variable=dacVars)
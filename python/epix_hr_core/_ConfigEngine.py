@@ -0,0 +1,128 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import numpy     as np
+import time
+
+##############################################################
+##
+## Diff based configuration apply
+##
+## A YAML configuration (same layout as pyrogue LoadConfig) is
+## compiled once into a write plan sorted by address and grouped
+## per device. Applying it compares every entry with the variable
+## shadow (last known hardware state) and only the changed
+## variables are staged. The blocks holding them are written in
+## one pass, then verified and checked in a second pass, so the
+## transactions of all devices are in flight together.
+##
+##############################################################
+class ConfigEngine(object):
+    def __init__(self, device):
+        self._device = device
+        self.stats   = {}
+
+    def compile(self, cfg):
+        """Compile a configuration (dict, YAML string or file name) into a write plan
+
+        The plan is a list of (variable, value) with the remote variables sorted by
+        address, followed by the local and link variables.
+        """
+        if isinstance(cfg, str):
+            if '\n' not in cfg:
+                with open(cfg) as f:
+                    cfg = f.read()
+            cfg = pr.yamlToData(cfg)
+
+        # The top level key is the name of the device the engine was built for
+        if self._device.name in cfg and len(cfg) == 1:
+            cfg = cfg[self._device.name]
+
+        remote, other = [], []
+        self._walk(self._device, cfg, remote, other)
+        remote.sort(key=lambda e: e[0].address)
+        return remote + other
+
+    def _walk(self, dev, cfg, remote, other):
+        for key, value in cfg.items():
+            # Keys are matched like LoadConfig does: names, wildcards (Delay*) and array slices (Pgp4Mon[0:2])
+            nodes = dev.nodeMatch(key)
+            if not nodes:
+                raise pr.DeviceError(f'{dev.path}: no node matches {key} in the configuration target')
+            for node in nodes:
+                if isinstance(node, pr.Device):
+                    self._walk(node, value, remote, other)
+                elif isinstance(node, pr.BaseVariable) and node.mode in ('RW', 'WO'):
+                    v = value
+                    if isinstance(v, str) and node.nativeType is not str:
+                        v = node.parseDisp(v)
+                    if isinstance(node, pr.RemoteVariable):
+                        remote.append((node, v))
+                    else:
+                        other.append((node, v))
+
+    def diff(self, plan):
+        """Return the plan entries whose value differs from the variable shadow"""
+        changed = []
+        for var, value in plan:
+            current = var.value()
+            if isinstance(current, np.ndarray) or isinstance(value, (list, np.ndarray)):
+                same = np.array_equal(np.asarray(current), np.asarray(value))
+            else:
+                same = current == value
+            if not same:
+                changed.append((var, value))
+        return changed
+
+    def sync(self, plan):
+        """Read back the blocks of the plan so the shadow matches the hardware"""
+        devs = self._group([e for e in plan if isinstance(e[0], pr.RemoteVariable)])
+        for dev, vars in devs.items():
+            dev.readBlocks(recurse=False, variable=vars)
+        for dev, vars in devs.items():
+            dev.checkBlocks(recurse=False, variable=vars)
+
+    @staticmethod
+    def _group(entries):
+        devs = {}
+        for var, value in entries:
+            devs.setdefault(var.parent, []).append(var)
+        return devs
+
+    def apply(self, plan, force=False):
+        """Write the changed entries of a compiled plan (all of them with force=True)"""
+        start = time.time()
+        changed = plan if force else self.diff(plan)
+        remote  = [e for e in changed if isinstance(e[0], pr.RemoteVariable)]
+        other   = [e for e in changed if not isinstance(e[0], pr.RemoteVariable)]
+
+        # Stage the new values, this only marks their blocks stale
+        for var, value in remote:
+            var.set(value, write=False)
+
+        # Post the writes of every device, then verify and check them
+        devs = self._group(remote)
+        for dev, vars in devs.items():
+            dev.writeBlocks(recurse=False, variable=vars)
+        for dev, vars in devs.items():
+            dev.verifyBlocks(recurse=False, variable=vars)
+        for dev, vars in devs.items():
+            dev.checkBlocks(recurse=False, variable=vars)
+
+        # Local and link variables have their own set logic
+        for var, value in other:
+            var.set(value)
+
+        self.stats = {'entries': len(plan), 'changed': len(changed), 'devices': len(devs), 'time': time.time() - start}
+        return self.stats
+
+    def load(self, cfg, force=False):
+        """Compile and apply a configuration in one call"""
+        return self.apply(self.compile(cfg), force=force)
@@ -0,0 +1,126 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import numpy     as np
+import os
+import time
+
+##############################################################
+##
+## HighSpeedDac to scope ADC transfer function characterization
+##
+## All boards are stepped together: the DAC writes go out to
+## every board, then the scopes are armed and one trace per
+## board is collected. The trace mean is the response, so a
+## point costs one DAC write and one arm per board.
+##
+##############################################################
+class DacCharacterization(object):
+    def __init__(self, settle=0.01, timeout=1.0, channel=0):
+        self.settle  = settle
+        self.timeout = timeout
+        self.channel = channel
+        self.boards  = {}
+        self.results = {}
+
+    def addBoard(self, name, dacDev, scopeDev, receiver):
+        """Add a board: HighSpeedDacRegisters, OscilloscopeRegisters and its OscilloscopeReceiver"""
+        self.boards[name] = (dacDev, scopeDev, receiver)
+
+    def sweep(self, codes):
+        """Step the DAC through codes, return the (len(codes), numBoards) mean responses"""
+        codes = np.asarray(codes, dtype=np.int64)
+        names = list(self.boards)
+        resp  = np.zeros((len(codes), len(names)))
+
+        saved = {}
+        for name, (dac, scope, rx) in self.boards.items():
+            saved[name] = (dac.waveformSource.get(), dac.WFEnabled.get(), scope.TriggerMode.get())
+            if scope.TriggerMode.value() == 0:
+                raise pr.DeviceError(f'{scope.path}: TriggerMode is Never')
+            dac.waveformSource.set(0)
+            dac.WFEnabled.set(False)
+            if scope.TriggerMode.value() == 3:
+                scope.TriggerMode.set(1)
+
+        try:
+            for i, code in enumerate(codes):
+                # Post the writes on every board before checking any of them
+                for dac, scope, rx in self.boards.values():
+                    dac.DacValue.set(int(code), write=False)
+                    dac.writeBlocks(variable=dac.DacValue)
+                for dac, scope, rx in self.boards.values():
+                    dac.checkBlocks(variable=dac.DacValue)
+                time.sleep(self.settle)
+
+                # Trace counts before arming, a trace landing while another board is waited on still counts
+                counts = [rx.traceCount() for dac, scope, rx in self.boards.values()]
+                for dac, scope, rx in self.boards.values():
+                    if scope.TriggerMode.value() != 2:
+                        scope.ArmReg.set(True)
+                for j, (dac, scope, rx) in enumerate(self.boards.values()):
+                    trace = rx.waitTrace(self.timeout, after=counts[j])
+                    if trace is None:
+                        raise pr.DeviceError(f'{scope.path}: timeout waiting for the trace at code {code}')
+                    resp[i, j] = trace[self.channel].mean()
+        finally:
+            for name, (dac, scope, rx) in self.boards.items():
+                dac.waveformSource.set(saved[name][0])
+                dac.WFEnabled.set(saved[name][1])
+                scope.TriggerMode.set(saved[name][2])
+
+        return resp
+
+    @staticmethod
+    def fit(codes, response):
+        """Least squares fit of response = gain*code + offset for every column at once
+
+        Returns gain, offset, INL (len(codes), ...) and DNL (len(codes)-1, ...),
+        INL and DNL in DAC codes.
+        """
+        codes = np.asarray(codes, dtype=np.float64)
+        y = np.asarray(response, dtype=np.float64)
+        shape = y.shape[1:]
+        y = y.reshape(len(codes), -1)
+
+        a = np.stack((codes, np.ones_like(codes)), axis=1)
+        coef = np.linalg.lstsq(a, y, rcond=None)[0]
+        gain, offset = coef
+        inl = (y - a @ coef) / gain
+        dnl = np.diff(y, axis=0) / gain / np.diff(codes)[:, np.newaxis] - 1.0
+        return (gain.reshape(shape), offset.reshape(shape),
+                inl.reshape((len(codes),) + shape), dnl.reshape((len(codes) - 1,) + shape))
+
+    def run(self, codes):
+        """Sweep and fit all boards, results are kept per board name"""
+        codes = np.asarray(codes, dtype=np.int64)
+        resp = self.sweep(codes)
+        gain, offset, inl, dnl = self.fit(codes, resp)
+        for j, name in enumerate(self.boards):
+            self.results[name] = {'codes': codes, 'response': resp[:, j], 'gain': gain[j],
+                                  'offset': offset[j], 'inl': inl[:, j], 'dnl': dnl[:, j]}
+        return self.results
+
+    def save(self, path):
+        """Write one correction table per board, <path>/dacCal_<board>.npz"""
+        os.makedirs(path, exist_ok=True)
+        for name, res in self.results.items():
+            np.savez(os.path.join(path, f'dacCal_{name}.npz'), **res)
+
+    @staticmethod
+    def load(path, board):
+        with np.load(os.path.join(path, f'dacCal_{board}.npz')) as data:
+            return {k: data[k] for k in data.files}
+
+    @staticmethod
+    def codeFor(table, response):
+        """DAC codes giving the requested response, interpolated on the measured curve"""
+        order = np.argsort(table['response'])
+        return np.rint(np.interp(response, table['response'][order], table['codes'][order])).astype(np.int64)
@@ -0,0 +1,141 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import os
+import threading
+
+##############################################################
+##
+## Long term archive of the slow ADC environmental data
+##
+## Each board gets a directory with fixed record files:
+##    raw.dat          timestamp + one float per channel
+##    rollup_<N>s.dat  timestamp, count, min, max, mean per N second bucket
+## The last rollup record is the bucket being filled, it is
+## updated in place so the files are always complete.
+##
+##############################################################
+class EnvironmentArchive(object):
+    def __init__(self, path, board, channelNames, resolutions=(1, 60, 3600)):
+        self.channelNames = list(channelNames)
+        self.resolutions  = sorted(resolutions)
+        self.dropCount    = 0
+        self._dir  = os.path.join(path, str(board))
+        self._lock = threading.Lock()
+        os.makedirs(self._dir, exist_ok=True)
+
+        n = len(self.channelNames)
+        self.rawDtype = np.dtype([('timestamp', 'f8'), ('data', 'f4', (n,))])
+        self.rollupDtype = np.dtype([('timestamp', 'f8'), ('count', 'u4'),
+                                     ('min', 'f4', (n,)), ('max', 'f4', (n,)), ('mean', 'f4', (n,))])
+
+        self._rawFile = os.path.join(self._dir, 'raw.dat')
+        self._rollupFiles = {res: os.path.join(self._dir, f'rollup_{res}s.dat') for res in self.resolutions}
+
+        # Last bucket of each level and last raw timestamp, recovered from the files
+        self._last = {res: self._lastRecord(self._rollupFiles[res], self.rollupDtype) for res in self.resolutions}
+        last = self._lastRecord(self._rawFile, self.rawDtype)
+        self._lastTime = -np.inf if last is None else float(last['timestamp'])
+
+    @staticmethod
+    def _lastRecord(fname, dtype):
+        if not os.path.exists(fname) or os.path.getsize(fname) < dtype.itemsize:
+            return None
+        with open(fname, 'rb') as f:
+            f.seek((os.path.getsize(fname) // dtype.itemsize - 1) * dtype.itemsize)
+            return np.frombuffer(f.read(dtype.itemsize), dtype=dtype)[0].copy()
+
+    def appendBatch(self, batch):
+        """Append a SlowAdcReceiver batch, can be registered with SlowAdcReceiver.addListener()"""
+        values = np.stack([batch[name] for name in self.channelNames], axis=1)
+        self.append(batch['timestamp'], values)
+
+    def append(self, timestamps, values):
+        """Append samples, timestamps (n,) in seconds and values (n, numChannels)"""
+        timestamps = np.asarray(timestamps, dtype=np.float64)
+        values     = np.asarray(values, dtype=np.float32).reshape(len(timestamps), -1)
+
+        with self._lock:
+            # Records must stay time ordered for the range queries
+            keep = timestamps >= np.maximum.accumulate(np.concatenate(([self._lastTime], timestamps)))[:-1]
+            self.dropCount += int(np.count_nonzero(~keep))
+            timestamps = timestamps[keep]
+            values = values[keep]
+            if len(timestamps) == 0:
+                return
+            self._lastTime = float(timestamps[-1])
+
+            raw = np.empty(len(timestamps), dtype=self.rawDtype)
+            raw['timestamp'] = timestamps
+            raw['data'] = values
+            with open(self._rawFile, 'ab') as f:
+                f.write(raw.tobytes())
+
+            for res in self.resolutions:
+                self._updateRollup(res, timestamps, values)
+
+    def _updateRollup(self, res, timestamps, values):
+        # Group the batch by bucket and reduce each group in one pass
+        bucket = np.floor(timestamps / res)
+        starts = np.concatenate(([0], np.flatnonzero(np.diff(bucket)) + 1))
+        count  = np.diff(np.concatenate((starts, [len(bucket)])))
+
+        rec = np.empty(len(starts), dtype=self.rollupDtype)
+        rec['timestamp'] = bucket[starts] * res
+        rec['count'] = count
+        rec['min']   = np.minimum.reduceat(values, starts, axis=0)
+        rec['max']   = np.maximum.reduceat(values, starts, axis=0)
+        rec['mean']  = np.add.reduceat(values.astype(np.float64), starts, axis=0) / count[:, np.newaxis]
+
+        fname = self._rollupFiles[res]
+        last = self._last[res]
+        if last is not None and last['timestamp'] == rec['timestamp'][0]:
+            # Merge the first group into the open bucket and rewrite it in place
+            first = rec[0]
+            total = last['count'] + first['count']
+            first['mean'] = (last['mean'] * np.float64(last['count']) + first['mean'] * np.float64(first['count'])) / total
+            first['min']  = np.minimum(last['min'], first['min'])
+            first['max']  = np.maximum(last['max'], first['max'])
+            first['count'] = total
+            with open(fname, 'r+b') as f:
+                f.seek(-self.rollupDtype.itemsize, os.SEEK_END)
+                f.write(rec.tobytes())
+        else:
+            with open(fname, 'ab') as f:
+                f.write(rec.tobytes())
+
+        self._last[res] = rec[-1].copy()
+
+    def _map(self, fname, dtype):
+        if not os.path.exists(fname) or os.path.getsize(fname) < dtype.itemsize:
+            return np.zeros(0, dtype=dtype)
+        return np.memmap(fname, dtype=dtype, mode='r', shape=(os.path.getsize(fname) // dtype.itemsize,))
+
+    def query(self, start, stop, resolution=None, maxPoints=2000):
+        """Return the records between start and stop (seconds)
+
+        resolution=0 selects the raw samples, None picks the finest rollup giving at
+        most maxPoints records. Only the selected range of the file is read.
+        """
+        if resolution is None:
+            fits = [res for res in self.resolutions if (stop - start) / res <= maxPoints]
+            resolution = fits[0] if fits else self.resolutions[-1]
+
+        if resolution == 0:
+            mm = self._map(self._rawFile, self.rawDtype)
+        elif resolution in self._rollupFiles:
+            mm = self._map(self._rollupFiles[resolution], self.rollupDtype)
+        else:
+            raise ValueError(f'Unknown resolution {resolution}, archive has {self.resolutions}')
+
+        ts = mm['timestamp']
+        lo = np.searchsorted(ts, start, side='left')
+        hi = np.searchsorted(ts, stop,  side='right')
+        return np.array(mm[lo:hi])
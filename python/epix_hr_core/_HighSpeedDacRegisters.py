@@ -8,9 +8,14 @@
 # contained in the LICENSE.txt file.
 #-----------------------------------------------------------------------------
 import pyrogue     as pr
+import numpy       as np
+import epix_hr_core as epixHrCore
 
-class HighSpeedDacRegisters(pr.Device):
-    def __init__(self,HsDacEnum={0:'None',1:'DAC A (SE)',2:'DAC B (Diff)',3:'DAC A & DAC B',}, DacModel='8812', MaximumDacValue = 32000,**kwargs):
+class HighSpeedDacRegisters(epixHrCore.CalibratedRailDevice):
+
+    WAVEFORM_DEPTH = 1024
+
+    def __init__(self,HsDacEnum={0:'None',1:'DAC A (SE)',2:'DAC B (Diff)',3:'DAC A & DAC B',}, DacModel='8812', MaximumDacValue = 32000, WaveformMemOffset = None, **kwargs):
         super().__init__(description='HS DAC Registers', **kwargs)
 
         # Creation. memBase is either the register bus server (srp, rce mapped memory, etc) or the device which
@@ -24,10 +29,11 @@ class HighSpeedDacRegisters(pr.Device):
         #############################################
 
         bitSize = 16
-        convFunc = self.convtFloat8812
+        self._voltsPerCode = 2.3/65536.0
         if (DacModel == 'Max5719a'):
             bitSize = 20
-            convFunc = self.convtFloatMax5719a
+            self._voltsPerCode = 2.5/1048576.0
+        self._maxCode = min(MaximumDacValue, (1 << bitSize) - 1)
 
         #Setup registers & variables
 
@@ -40,7 +46,7 @@ class HighSpeedDacRegisters(pr.Device):
             pr.RemoteVariable(name='DacValue',        description='Set a fixed value for the DAC',                     offset=0x00000008, bitSize=bitSize,  bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', maximum = MaximumDacValue)
         ))
 
-        self.add((pr.LinkVariable  (name='DacValueV' ,      linkedGet=convFunc,        dependencies=[self.DacValue])))
+        self.addRail('DacValueV', self.DacValue, self._voltsPerCode, maxCode=self._maxCode)
 
         if (DacModel != 'Max5719a'):
             self.add((pr.RemoteVariable(name='DacChannel',      description='Select the DAC channel to use',                     offset=0x00000008, bitSize=2,   bitOffset=bitSize,  mode='RW', enum=HsDacEnum)))
@@ -52,7 +58,13 @@ class HighSpeedDacRegisters(pr.Device):
             pr.RemoteVariable(name='dacValueRBV',     description='Current DAC value',                                 offset=0x0000001C, bitSize=bitSize,  bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RO', pollInterval = 1)
         ))
 
-        self.add((pr.LinkVariable  (name='DacValueVRBV' ,      linkedGet=convFunc,        dependencies=[self.dacValueRBV])))
+        self.addRail('DacValueVRBV', self.dacValueRBV, self._voltsPerCode, maxCode=(1 << bitSize) - 1, readOnly=True, calibrationOf='DacValueV')
+
+        # The waveform AxiDualPortRam sits on its own AXI-Lite port, WaveformMemOffset is its
+        # address relative to this device. All entries form a single block (one transaction).
+        if WaveformMemOffset is not None:
+            self.add(pr.RemoteVariable(name='WaveformMem',  description='Custom waveform memory (DAC codes)',             offset=WaveformMemOffset, bitSize=bitSize, bitOffset=0, base=pr.UInt, mode='RW',
+                                       numValues=self.WAVEFORM_DEPTH, valueBits=bitSize, valueStride=32, hidden=True))
 
         #####################################
         # Create commands
@@ -65,17 +77,43 @@ class HighSpeedDacRegisters(pr.Device):
         # The command object and the arg are passed
 
 
-    @staticmethod
-    def convtFloat8812(dev, var):
-        value   = var.dependencies[0].get(read=False)
-        fpValue = value*(2.3/65536.0) # Modified from 2.5 to 2.3 due to the bug on the PCB Bandgap
-        return '%0.3f'%(fpValue)
-
-    @staticmethod
-    def convtFloatMax5719a(dev, var):
-        value   = var.dependencies[0].get(read=False)
-        fpValue = value*(2.5/1048576.0)
-        return '%0.3f'%(fpValue)
+    def _waveformMem(self):
+        if 'WaveformMem' not in self.variables:
+            raise pr.DeviceError(f'{self.path}: no waveform memory, WaveformMemOffset was not given')
+        return self.WaveformMem
+
+    def setWaveform(self, values, units='volts'):
+        """Load the custom waveform memory with one block write and one verify read
+
+        values is in volts (DacValueV calibration applied) or DAC codes (units='codes'),
+        shorter waveforms hold the last value.
+        """
+        mem    = self._waveformMem()
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0 or len(values) > self.WAVEFORM_DEPTH:
+            raise ValueError(f'Waveform length {len(values)} must be 1 to {self.WAVEFORM_DEPTH}')
+        if units == 'volts':
+            values = (values - self.DacValueVOffset.value()) / (self.DacValueVGain.value() * self._voltsPerCode)
+        elif units != 'codes':
+            raise ValueError(f'Unknown units {units}')
+
+        codes = np.rint(values)
+        bad = ~np.isfinite(codes) | (codes < 0) | (codes > self._maxCode)
+        if np.any(bad):
+            raise ValueError(f'{self.path}: waveform samples {np.flatnonzero(bad)[:10].tolist()} are outside the DAC range (0 to {self._maxCode} codes)')
+
+        full = np.empty(self.WAVEFORM_DEPTH, dtype=np.uint32)
+        full[:len(codes)] = codes
+        full[len(codes):] = full[len(codes)-1]
+
+        mem.set(full)
+
+    def getWaveform(self, units='volts'):
+        """Read back the waveform memory"""
+        codes = np.asarray(self._waveformMem().get(), dtype=np.uint32)
+        if units == 'codes':
+            return codes
+        return codes * self._voltsPerCode * self.DacValueVGain.value() + self.DacValueVOffset.value()
 
     @staticmethod
     def frequencyConverter(self):
@@ -0,0 +1,141 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import threading
+import time
+
+##############################################################
+##
+## Deserializer lane watchdog
+##
+## Every period the Locked and LockErrors arrays of an
+## AsicDeserMultiStream (6St / 24St) are read in one block.
+## A channel is degraded when it is not locked or its lock
+## error count grew by more than lockErrorThreshold.
+## Only degraded channels are recalibrated:
+##    - IdelayRst (0x08) pulsed with their lane mask
+##    - their delays swept together, IserdeseRst (0x0C) pulsed
+##      with the lane mask after every tap
+##    - the eye center set, IserdeseRst pulsed again
+## All writes are raw single word accesses of the registers
+## of those channels, the other lanes keep taking data (no
+## Resync, no rewrite of the shared delay block).
+##
+##############################################################
+class LaneWatchdog(object):
+    def __init__(self, deser, period=1.0, lockErrorThreshold=0, numDelayTaps=512, checks=1, eyeFactor=0.5, minEye=8):
+        self.deser     = deser
+        self.period    = period
+        self.lockErrorThreshold = lockErrorThreshold
+        self.numDelayTaps = numDelayTaps
+        self.checks    = checks
+        self.eyeFactor = eyeFactor
+        self.minEye    = minEye
+        self.events    = []
+        self._listeners = []
+        self._prevErrors = None
+        self._stop     = threading.Event()
+        self._thread   = None
+
+    def addListener(self, func):
+        """func(event) is called after every recalibration, event is a dict"""
+        self._listeners.append(func)
+
+    def status(self):
+        """Read Locked and LockErrors of all channels in one block"""
+        dev = self.deser
+        dev.readBlocks(variable=[dev.Locked, dev.LockErrors])
+        dev.checkBlocks(variable=[dev.Locked, dev.LockErrors])
+        return np.asarray(dev.Locked.value(), dtype=bool), np.asarray(dev.LockErrors.value(), dtype=np.int64)
+
+    def check(self):
+        """Return the indices of the degraded channels"""
+        locked, errors = self.status()
+        if self._prevErrors is None:
+            self._prevErrors = errors
+        grown = np.mod(errors - self._prevErrors, 1 << 16) > self.lockErrorThreshold
+        self._prevErrors = errors
+        return np.flatnonzero(~locked | grown)
+
+    def _pulse(self, offset, mask):
+        old = int(np.atleast_1d(self.deser._rawRead(offset, 1))[0])
+        self.deser._rawWrite(offset, old | mask)
+        self.deser._rawWrite(offset, old & ~mask)
+
+    def _setDelay(self, ch, delay):
+        # Same sequence as AsicDeserMultiStream.setDelay: load bit (bit 9) first
+        self.deser._rawWrite(0x10 + 4*int(ch), int(delay) + 512)
+        if self.deser._delayReload:
+            self.deser._rawWrite(0x10 + 4*int(ch), int(delay))
+
+    def recalibrate(self, channels):
+        """Sweep and set the delays of the given channels only, return {channel: delay or None}"""
+        dev      = self.deser
+        channels = np.asarray(channels, dtype=int)
+        mask     = int(np.bitwise_or.reduce(1 << channels))
+        start    = time.time()
+
+        self._pulse(0x08, mask)
+        hits = np.zeros((len(channels), self.numDelayTaps))
+        for tap in range(self.numDelayTaps):
+            for ch in channels:
+                self._setDelay(ch, tap)
+            self._pulse(0x0C, mask)
+            time.sleep(1.0 / float(100))
+            for check in range(self.checks):
+                hits[:, tap] += dev._idleMatch(dev.getIserdeseOut()[channels, 0])
+
+        sug, runs = dev._eyeCenters(hits != 0, self.eyeFactor)
+        result = {}
+        for i, ch in enumerate(channels):
+            if runs[i].max() >= self.minEye:
+                self._setDelay(ch, sug[i])
+                result[int(ch)] = int(sug[i])
+            else:
+                result[int(ch)] = None
+        self._pulse(0x0C, mask)
+
+        # Bring the shadows back in line with the raw writes
+        dev.Delays_.get()
+        dev.IdelayRst.get()
+        dev.IserdeseRst.get()
+        self._prevErrors = None
+
+        event = {'time': start, 'duration': time.time() - start, 'delays': result}
+        self.events.append(event)
+        for func in self._listeners:
+            func(event)
+        return result
+
+    def step(self):
+        """One watchdog cycle: check and recalibrate the degraded channels"""
+        bad = self.check()
+        if len(bad):
+            print(f'{self.deser.path}: recalibrating channels {[int(c) for c in bad]}')
+            return self.recalibrate(bad)
+        return {}
+
+    def start(self):
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f'LaneWatchdog.{self.deser.name}', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.wait(self.period):
+            try:
+                self.step()
+            except Exception as e:
+                print(f'{self.deser.path}: watchdog error: {e}')
@@ -0,0 +1,184 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import numpy     as np
+import http.server
+import threading
+import time
+import os
+import re
+
+##############################################################
+##
+## Health counter exporter
+##
+## addDevice() registers the read only remote variables of a
+## device (Pgp4AxiL link monitors, TriggerRegisters counters,
+## deserializer LockErrors / BERTCounters, jitter cleaner
+## Lol / Los, ...). Array variables (LockErrors, BERTCounters)
+## are exported one sample per element with an index label,
+## one block read covers all the channels. A thread block reads them on every board
+## each period and renders the Prometheus text exposition format
+## once. Every variable is exported as a value gauge; counters
+## (names matching COUNTERS or the counters= argument) also get
+## a delta (with counter wrap) and a rate, computed in numpy.
+## Status bits such as Locked or Lol are values only. The HTTP server and the text file only serve that
+## cached text, scraping never touches the bus.
+##
+##############################################################
+
+# Default counter name patterns: RxFrameCnt, LockErrors, BERTCounters, lockedFallCount, ...
+COUNTERS = [r'(Cnt|Count|Counters?|Errors)\d*$']
+
+class MetricsExporter(object):
+    def __init__(self, period=5.0, port=None, host='127.0.0.1', path=None, prefix='epixhr'):
+        self.period  = period
+        self.port    = port
+        self.host    = host
+        self.path    = path
+        self.prefix  = prefix
+        self.boards  = {}
+        self.text    = ''
+        self._stop   = threading.Event()
+        self._thread = None
+        self._server = None
+
+    def addDevice(self, board, dev, include=None, counters=None):
+        """Export the numeric read only remote variables of dev (names matching an include regex)
+
+        For a deserializer include=['^LockErrors$', '^Locked$', '^BERTCounters$'] exports
+        the array form only, without the per channel scalars. counters is the list of name
+        regexes of the counter variables (default COUNTERS), only those get a delta and a rate.
+        """
+        if counters is None:
+            counters = COUNTERS
+        b = self.boards.setdefault(board, {'vars': [], 'counter': [], 'prev': None, 'time': None, 'ok': 0})
+        for var in dev.variableList:
+            if not isinstance(var, pr.RemoteVariable) or var.mode != 'RO':
+                continue
+            if type(var._base).__name__ not in ('UInt', 'Int', 'Bool'):
+                continue
+            if include is not None and not any(re.search(p, var.name) for p in include):
+                continue
+            b['vars'].append(var)
+            b['counter'].append(any(re.search(p, var.name) for p in counters))
+
+        # One sample per scalar or array element: labels, counter flag and counter wrap modulus
+        mod, labels, counter = [], [], []
+        for v, isCounter in zip(b['vars'], b['counter']):
+            lbl = f'board="{_escape(board)}",device="{_escape(v.parent.path)}",name="{_escape(v.name)}"'
+            numValues = getattr(v, '_numValues', 0)
+            if numValues:
+                mod.extend([float(1 << v._valueBits)] * numValues)
+                labels.extend(f'{lbl},index="{i}"' for i in range(numValues))
+            else:
+                mod.append(float(1 << sum(v.bitSize)))
+                labels.append(lbl)
+            counter.extend([isCounter] * max(numValues, 1))
+        b['counterMask'] = np.array(counter, dtype=bool)
+        b['mod'] = np.array(mod)[b['counterMask']]
+        b['labels'] = labels
+        b['counterLabels'] = [lbl for lbl, c in zip(labels, counter) if c]
+        b['prev'] = None
+        b.pop('delta', None)
+        b.pop('rate', None)
+
+    def poll(self):
+        """Read all boards once and render the exposition text"""
+        for board, b in self.boards.items():
+            start = time.time()
+            try:
+                devs = {}
+                for var in b['vars']:
+                    devs.setdefault(var.parent, []).append(var)
+                for dev, vars in devs.items():
+                    dev.readBlocks(recurse=False, variable=vars)
+                for dev, vars in devs.items():
+                    dev.checkBlocks(recurse=False, variable=vars)
+                cur = np.concatenate([np.atleast_1d(np.asarray(v.value(), dtype=np.float64)) for v in b['vars']])
+                b['ok'] = 1
+            except Exception as e:
+                print(f'MetricsExporter: {board}: {e}')
+                b['ok'] = 0
+                cur = None
+
+            now = time.time()
+            if cur is not None:
+                count = cur[b['counterMask']]
+                if b['prev'] is not None:
+                    b['delta'] = np.mod(count - b['prev'], b['mod'])
+                    b['rate']  = b['delta'] / (now - b['time'])
+                b['value'], b['prev'], b['time'] = cur, count, now
+            b['pollTime'] = now - start
+        self.text = self._render()
+
+        if self.path is not None:
+            tmp = self.path + '.tmp'
+            with open(tmp, 'w') as f:
+                f.write(self.text)
+            os.replace(tmp, self.path)
+        return self.text
+
+    def _render(self):
+        p = self.prefix
+        out = [f'# TYPE {p}_up gauge', f'# TYPE {p}_poll_seconds gauge']
+        for board, b in self.boards.items():
+            out.append(f'{p}_up{{board="{_escape(board)}"}} {b["ok"]}')
+            out.append(f'{p}_poll_seconds{{board="{_escape(board)}"}} {b.get("pollTime", 0.0):g}')
+        for metric, labels in (('value', 'labels'), ('delta', 'counterLabels'), ('rate', 'counterLabels')):
+            out.append(f'# TYPE {p}_register_{metric} gauge')
+            for board, b in self.boards.items():
+                if metric in b:
+                    out.extend(f'{p}_register_{metric}{{{lbl}}} {v:g}' for lbl, v in zip(b[labels], b[metric]))
+        return '\n'.join(out) + '\n'
+
+    def start(self):
+        """Start the poll thread and, with a port, the HTTP server"""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._pollRun, name='MetricsExporter', daemon=True)
+        self._thread.start()
+
+        if self.port is not None:
+            exporter = self
+
+            class Handler(http.server.BaseHTTPRequestHandler):
+                def do_GET(self):
+                    body = exporter.text.encode()
+                    self.send_response(200)
+                    self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+
+                def log_message(self, *args):
+                    pass
+
+            self._server = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+            threading.Thread(target=self._server.serve_forever, name='MetricsExporterHttp', daemon=True).start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def _pollRun(self):
+        while not self._stop.is_set():
+            start = time.time()
+            self.poll()
+            self._stop.wait(max(0.0, self.period - (time.time() - start)))
+
+def _escape(value):
+    """Label value escaping of the text exposition format"""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
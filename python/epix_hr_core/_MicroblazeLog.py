@@ -8,11 +8,28 @@
 # contained in the LICENSE.txt file.
 #-----------------------------------------------------------------------------
 import pyrogue     as pr
+import numpy       as np
+import logging
+import logging.handlers
+import threading
 
 class MicroblazeLog(pr.Device):
+
+    # MemLow and MemHigh are contiguous, together a 4092 byte ring starting at 0x4
+    RING_OFFSET = 0x4
+    RING_SIZE   = 2048 + 2044
+
     def __init__(self, **kwargs):
         super().__init__(description='Microblaze log buffer', **kwargs)
 
+        self._tailPtr     = None
+        self._tailLen     = 0
+        self._partial     = ''
+        self._listeners   = []
+        self._tailThread  = None
+        self._tailStop    = threading.Event()
+        self._tailLogger  = None
+
         # Creation. memBase is either the register bus server (srp, rce mapped memory, etc) or the device which
         # contains this object. In most cases the parent and memBase are the same but they can be
         # different in more complex bus structures. They will also be different for the top most node.
@@ -43,6 +60,89 @@ class MicroblazeLog(pr.Device):
         # A command can also be a call to a local function with local scope.
         # The command object and the arg are passed
 
+    def addLineListener(self, func):
+        """Register func(line) called for every new log line"""
+        self._listeners.append(func)
+
+    def _readRing(self, start, count):
+        # Word aligned raw read of count bytes starting at ring byte start (no wrap)
+        first = start // 4
+        last  = (start + count + 3) // 4
+        words = self._rawRead(self.RING_OFFSET + first*4, last - first)
+        if last - first == 1:
+            words = [words]
+        data = np.array(words, dtype='<u4').tobytes()
+        return data[start - first*4:start - first*4 + count]
+
+    def tail(self):
+        """Read only the bytes written since the last call and return the complete new lines"""
+        info   = self._rawRead(0x0)
+        ptr    = info & 0xFFFF
+        length = (info >> 16) & 0xFFFF
+
+        if self._tailPtr is None or length < self._tailLen:
+            # First call or log restarted, start from the oldest valid byte
+            self._tailPtr = 0 if length < self.RING_SIZE else ptr
+            self._partial = ''
+            new = length if length < self.RING_SIZE else self.RING_SIZE
+        else:
+            new = (ptr - self._tailPtr) % self.RING_SIZE
+        self._tailLen = length
+
+        if new == 0:
+            return []
+
+        start = self._tailPtr
+        count = min(new, self.RING_SIZE - start)
+        data = self._readRing(start, count)
+        if count < new:
+            data += self._readRing(0, new - count)
+        self._tailPtr = ptr
+
+        text = self._partial + data.decode('ascii', errors='replace').replace('\x00', '')
+        lines = text.split('\n')
+        self._partial = lines.pop()
+
+        for line in lines:
+            for func in self._listeners:
+                func(line)
+            if self._tailLogger is not None:
+                self._tailLogger.info(line)
+        return lines
+
+    def startTail(self, period=1.0, filename=None, maxBytes=1 << 20, backupCount=5):
+        """Poll the log every period seconds, optionally writing lines to a rotating file"""
+        self.stopTail()
+        if filename is not None:
+            self._tailLogger = logging.getLogger(f'{self.path}.tail')
+            self._tailLogger.propagate = False
+            self._tailLogger.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(filename, maxBytes=maxBytes, backupCount=backupCount)
+            handler.setFormatter(logging.Formatter('%(asctime)s %(message)s'))
+            self._tailLogger.addHandler(handler)
+
+        self._tailStop.clear()
+        self._tailThread = threading.Thread(target=self._tailRun, args=(period,), daemon=True)
+        self._tailThread.start()
+
+    def stopTail(self):
+        if self._tailThread is not None:
+            self._tailStop.set()
+            self._tailThread.join()
+            self._tailThread = None
+        if self._tailLogger is not None:
+            for handler in list(self._tailLogger.handlers):
+                self._tailLogger.removeHandler(handler)
+                handler.close()
+            self._tailLogger = None
+
+    def _tailRun(self, period):
+        while not self._tailStop.wait(period):
+            try:
+                self.tail()
+            except Exception as e:
+                self._log.warning(f'Log tail failed: {e}')
+
     @staticmethod
     def frequencyConverter(self):
         def func(dev, var):
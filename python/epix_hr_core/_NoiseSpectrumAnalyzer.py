@@ -0,0 +1,145 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import threading
+import time
+
+##############################################################
+##
+## Welch noise spectra of batches of scope traces or
+## monitoring ADC samples. Memory is bounded: the average is
+## a moving window of numAverages batch spectra and the peak
+## history is a ring of historyLen entries.
+##
+##############################################################
+class NoiseSpectrumAnalyzer(object):
+    def __init__(self,
+                 nfft        = 1024,
+                 sampleRate  = 1.0,
+                 overlap     = 0.5,
+                 numChannels = 2,
+                 numAverages = 64,
+                 numPeaks    = 5,
+                 historyLen  = 1024,
+                 batchSize   = 16):
+
+        self.nfft        = nfft
+        self.sampleRate  = sampleRate
+        self.numChannels = numChannels
+        self.numPeaks    = numPeaks
+        self._hop        = max(1, int(nfft * (1.0 - overlap)))
+        self._window     = np.hanning(nfft)
+        self._lock       = threading.Lock()
+
+        # One sided PSD scaling (V**2/Hz when the input is in V)
+        self._scale = np.full(nfft//2 + 1, 2.0 / (sampleRate * np.sum(self._window**2)))
+        self._scale[0] = self._scale[0] / 2
+        if nfft % 2 == 0:
+            self._scale[-1] = self._scale[-1] / 2
+
+        nFreq = nfft//2 + 1
+        self.frequencies = np.fft.rfftfreq(nfft, 1.0 / sampleRate)
+
+        # Moving average accumulators
+        self._spectra = np.zeros((numAverages, numChannels, nFreq))
+        self._sum     = np.zeros((numChannels, nFreq))
+        self._nSpec   = 0
+
+        # Peak history ring
+        self._peakTime  = np.zeros(historyLen)
+        self._peakFreq  = np.zeros((historyLen, numChannels, numPeaks))
+        self._peakPower = np.zeros((historyLen, numChannels, numPeaks))
+        self._nPeak     = 0
+
+        # Batch buffer for per trace feeding (see addTrace)
+        self._batch  = None
+        self._nBatch = 0
+        self._batchSize = batchSize
+
+    def reset(self):
+        with self._lock:
+            self._spectra.fill(0)
+            self._sum.fill(0)
+            self._nSpec  = 0
+            self._nPeak  = 0
+            self._nBatch = 0
+
+    def addTrace(self, trace):
+        """Buffer one (numChannels, n) trace, the batch is processed when full
+
+        Can be registered with OscilloscopeReceiver.addTraceListener().
+        """
+        if self._batch is None or self._batch.shape[2] != np.shape(trace)[-1]:
+            self._batch  = np.zeros((self._batchSize, self.numChannels, np.shape(trace)[-1]))
+            self._nBatch = 0
+        self._batch[self._nBatch] = trace
+        self._nBatch += 1
+        if self._nBatch == self._batchSize:
+            self.process(self._batch)
+            self._nBatch = 0
+
+    def process(self, traces, timestamp=None):
+        """Process a batch of traces, shape (nTraces, numChannels, n) with n >= nfft"""
+        traces = np.asarray(traces, dtype=np.float64)
+        if traces.ndim == 2:
+            traces = traces[:, np.newaxis, :]
+
+        # All Welch segments of all traces in one rfft call
+        seg = np.lib.stride_tricks.sliding_window_view(traces, self.nfft, axis=-1)[..., ::self._hop, :]
+        seg = seg - seg.mean(axis=-1, keepdims=True)
+        spec = np.abs(np.fft.rfft(seg * self._window, axis=-1))**2
+        psd = spec.mean(axis=(0, 2)) * self._scale
+
+        with self._lock:
+            slot = self._nSpec % self._spectra.shape[0]
+            self._sum -= self._spectra[slot]
+            self._spectra[slot] = psd
+            if slot == 0:
+                # Refresh the running sum once per wrap to stop rounding drift
+                self._sum[...] = self._spectra.sum(axis=0)
+            else:
+                self._sum += psd
+            self._nSpec += 1
+            self._trackPeaks(psd, time.time() if timestamp is None else timestamp)
+
+        return psd
+
+    def _trackPeaks(self, psd, timestamp):
+        # Local maxima excluding DC, the largest numPeaks per channel
+        p = np.full(psd.shape, -np.inf)
+        isMax = (psd[:, 1:-1] > psd[:, :-2]) & (psd[:, 1:-1] >= psd[:, 2:])
+        p[:, 1:-1] = np.where(isMax, psd[:, 1:-1], -np.inf)
+        idx = np.argpartition(p, -self.numPeaks, axis=1)[:, -self.numPeaks:]
+        order = np.argsort(np.take_along_axis(p, idx, axis=1), axis=1)[:, ::-1]
+        idx = np.take_along_axis(idx, order, axis=1)
+        found = np.isfinite(np.take_along_axis(p, idx, axis=1))
+
+        slot = self._nPeak % self._peakTime.shape[0]
+        self._peakTime[slot]  = timestamp
+        self._peakFreq[slot]  = np.where(found, self.frequencies[idx], np.nan)
+        self._peakPower[slot] = np.where(found, np.take_along_axis(psd, idx, axis=1), np.nan)
+        self._nPeak += 1
+
+    @property
+    def spectrum(self):
+        """Averaged PSD over the last numAverages batches, shape (numChannels, nfft//2+1)"""
+        with self._lock:
+            n = min(self._nSpec, self._spectra.shape[0])
+            if n == 0:
+                return np.zeros_like(self._sum)
+            return self._sum / n
+
+    def getPeakHistory(self):
+        """Return (timestamps, frequencies, powers) of the tracked peaks, oldest first"""
+        with self._lock:
+            depth = self._peakTime.shape[0]
+            n = min(self._nPeak, depth)
+            idx = np.arange(self._nPeak - n, self._nPeak) % depth
+            return self._peakTime[idx], self._peakFreq[idx], self._peakPower[idx]
@@ -0,0 +1,126 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import numpy     as np
+import threading
+
+##############################################################
+##
+## Stream receiver for the PseudoScope2Axi frames
+##
+## Frame layout (16 bit words, see PseudoScope2Axi.vhd):
+##    16 header words  (word 0 = lane/VC, word 3 = quad/opcode)
+##    TraceLength+1 samples of channel A
+##    TraceLength+1 samples of channel B
+##    10 footer words
+##
+##############################################################
+class OscilloscopeReceiver(pr.DataReceiver):
+
+    HEADER_WORDS = 16
+    FOOTER_WORDS = 10
+    SCOPE_VC     = 2
+
+    def __init__(self, scopeDev=None, depth=64, **kwargs):
+        super().__init__(description='Virtual Oscilloscope stream receiver', hideData=True, **kwargs)
+
+        # scopeDev is the OscilloscopeRegisters device generating the stream. When given the
+        # received frames are checked against the TraceLength shadow value (no register access).
+        self._scope     = scopeDev
+        self._depth     = depth
+        self._lock      = threading.Condition()
+        self._header    = np.zeros(self.HEADER_WORDS, dtype='<u2')
+        self._ring      = np.zeros((depth, 2, 0), dtype='<u2')
+        self._total     = 0
+        self._listeners = []
+
+        self.add(pr.LocalVariable(name='TraceLength',   description='Samples per channel in the last trace', mode='RO', value=0, disp='{}'))
+        self.add(pr.LocalVariable(name='TraceCount',    description='Number of traces received',             mode='RO', value=0, disp='{}', pollInterval=1))
+        self.add(pr.LocalVariable(name='BadFrameCount', description='Frames with bad header or length',      mode='RO', value=0, disp='{}', pollInterval=1))
+        self.add(pr.LocalVariable(name='Depth',         description='Ring buffer depth in traces',           mode='RO', value=depth, disp='{}'))
+
+    def countReset(self):
+        super().countReset()
+        self.TraceCount.set(0, write=False)
+        self.BadFrameCount.set(0, write=False)
+
+    def addTraceListener(self, func):
+        """Register func(trace) called for every trace, trace is a (2, n) view into the ring"""
+        self._listeners.append(func)
+
+    def process(self, frame):
+        size = frame.getPayload()
+        words = size // 2
+        nSamples = (words - self.HEADER_WORDS - self.FOOTER_WORDS) // 2
+
+        # Check the frame size and the header before touching the ring buffer
+        if (size % 4) != 0 or nSamples <= 0:
+            self._badFrame()
+            return
+
+        if self._scope is not None and nSamples != (self._scope.TraceLength.value() + 1):
+            self._badFrame()
+            return
+
+        frame.read(self._header, 0)
+        if (self._header[0] & 0x3) != self.SCOPE_VC:
+            self._badFrame()
+            return
+
+        with self._lock:
+            if self._ring.shape[2] != nSamples:
+                self._ring  = np.zeros((self._depth, 2, nSamples), dtype='<u2')
+                self._total = 0
+
+            # Copy both channels straight from the frame into the ring slot
+            slot  = self._total % self._depth
+            trace = self._ring[slot]
+            frame.read(trace[0], self.HEADER_WORDS*2)
+            frame.read(trace[1], (self.HEADER_WORDS + nSamples)*2)
+            self._total += 1
+            self._lock.notify_all()
+
+        for func in self._listeners:
+            func(trace)
+
+        self.TraceLength.set(nSamples, write=False)
+        with self.TraceCount.lock:
+            self.TraceCount.set(self.TraceCount.value() + 1, write=False)
+        self.Updated.set(True, write=False)
+
+    def _badFrame(self):
+        with self.BadFrameCount.lock:
+            self.BadFrameCount.set(self.BadFrameCount.value() + 1, write=False)
+
+    def getTraces(self, count=None):
+        """Return a copy of the last count traces, oldest first, shape (count, 2, n)"""
+        with self._lock:
+            avail = min(self._total, self._depth)
+            if count is None or count > avail:
+                count = avail
+            idx = np.arange(self._total - count, self._total) % self._depth
+            return self._ring[idx].copy()
+
+    def traceCount(self):
+        """Number of traces received so far, pass it to waitTrace(after=) before arming"""
+        with self._lock:
+            return self._total
+
+    def waitTrace(self, timeout=1.0, after=None):
+        """Block until a trace arrives and return a (2, n) copy, None on timeout
+
+        By default only traces arriving after the call count, with after=traceCount()
+        taken before arming a trace that already arrived is returned immediately.
+        """
+        with self._lock:
+            start = self._total if after is None else after
+            if not self._lock.wait_for(lambda: self._total > start, timeout):
+                return None
+            return self._ring[(self._total - 1) % self._depth].copy()
@@ -7,7 +7,11 @@
 # copied, modified, propagated, or distributed except according to the terms
 # contained in the LICENSE.txt file.
 #-----------------------------------------------------------------------------
-import pyrogue     as pr
+import pyrogue      as pr
+import epix_hr_core as epixHrCore
+import numpy        as np
+import threading
+import time
 
 class OscilloscopeRegisters(pr.Device):
     def __init__(self, trigChEnum, inChaEnum, inChbEnum, **kwargs):
@@ -45,6 +49,17 @@ class OscilloscopeRegisters(pr.Device):
             pr.RemoteVariable(name='InputChannelB',   description='Setting4', offset=0x00000014, bitSize=2,  bitOffset=5,  mode='RW', enum=inChbEnum)))
         self.add(pr.RemoteVariable(name='TriggerDelay',    description='TriggerDelay',      offset=0x00000018, bitSize=13, bitOffset=0, base=pr.UInt, disp = '{}', mode='RW'))
 
+        # Continuous acquisition state, traces are delivered by an OscilloscopeReceiver (see attachReceiver)
+        self.add(pr.LocalVariable(name='ContinuousEn', description='Continuous acquisition running',  mode='RO', value=False))
+        self.add(pr.LocalVariable(name='AverageCount', description='Traces in the running average',   mode='RO', value=0, disp='{}', pollInterval=1))
+        self.add(pr.LocalVariable(name='TraceRate',    description='Achieved trace rate',             mode='RO', value=0.0, units='Hz', disp='{:1.1f}', pollInterval=1))
+
+        self._receiver = None
+        self._accum    = epixHrCore.TraceAccumulator()
+        self._accLock  = threading.Lock()
+        self._rateTime = 0.0
+        self._rateCnt  = 0
+
 
         #####################################
         # Create commands
@@ -55,6 +70,141 @@ class OscilloscopeRegisters(pr.Device):
         # the passed arg is available as 'arg'. Use 'dev' to get to device scope.
         # A command can also be a call to a local function with local scope.
         # The command object and the arg are passed
+        self.add(pr.LocalCommand(name='StartContinuous', description='Clear the average and start auto re-armed acquisition', function=self.fnStartContinuous))
+        self.add(pr.LocalCommand(name='StopContinuous',  description='Stop continuous acquisition',                            function=self.fnStopContinuous))
+        self.add(pr.LocalCommand(name='ResetAverage',    description='Clear the running average and envelopes',                function=self.fnResetAverage))
+        self.add(pr.LocalCommand(name='CaptureSegmented', description='Capture and stitch a waveform of the given length in samples', value=16384, function=self.fnCaptureSegmented))
+
+    def attachReceiver(self, receiver):
+        """Connect the OscilloscopeReceiver that gets the stream of this scope"""
+        self._receiver = receiver
+        receiver.addTraceListener(self._traceArrived)
+
+    def fnStartContinuous(self, dev, cmd, arg):
+        """Start continuous acquisition, re-arming on each trace unless TriggerMode is Always"""
+        if self._receiver is None:
+            raise pr.DeviceError(f'{self.path}: no OscilloscopeReceiver attached')
+        self.fnResetAverage(dev, cmd, arg)
+        self.ContinuousEn.set(True)
+        if self.TriggerMode.value() != 3:
+            self.ArmReg.set(True)
+
+    def fnStopContinuous(self, dev, cmd, arg):
+        self.ContinuousEn.set(False)
+
+    def fnResetAverage(self, dev, cmd, arg):
+        with self._accLock:
+            self._accum.reset()
+        self._rateTime = time.monotonic()
+        self._rateCnt  = 0
+        self.AverageCount.set(0)
+        self.TraceRate.set(0.0)
+
+    def _traceArrived(self, trace):
+        if not self.ContinuousEn.value():
+            return
+
+        # Re-arm first so the next capture overlaps with the averaging
+        if self.TriggerMode.value() != 3:
+            self.ArmReg.set(True)
+
+        with self._accLock:
+            self._accum.add(trace)
+            count = self._accum.count
+        self.AverageCount.set(count, write=False)
+
+        self._rateCnt += 1
+        now = time.monotonic()
+        if now - self._rateTime >= 1.0:
+            self.TraceRate.set(self._rateCnt / (now - self._rateTime), write=False)
+            self._rateTime = now
+            self._rateCnt  = 0
+
+    def fnCaptureSegmented(self, dev, cmd, arg):
+        self.segmentedTrace = self.captureSegmented(int(arg))
+        print(f'Segmented capture done, {self.segmentedTrace.shape[1]} samples per channel')
+
+    def captureSegmented(self, totalLength, overlap=64, maxShift=8, clocksPerSample=1, timeout=1.0):
+        """Capture a waveform longer than one trace on a repetitive signal
+
+        Consecutive captures are shifted by stepping TriggerOffset (in clock cycles),
+        each segment overlaps the previous one by overlap samples and is aligned to it
+        within +/- maxShift samples before being stitched into the (2, totalLength) result.
+        clocksPerSample is the number of scope clock cycles per ADC sample, SkipSamples
+        is accounted for.
+        """
+        if self._receiver is None:
+            raise pr.DeviceError(f'{self.path}: no OscilloscopeReceiver attached')
+        if self.ContinuousEn.value():
+            raise pr.DeviceError(f'{self.path}: stop continuous acquisition first')
+        if overlap - 2*maxShift < 8:
+            raise ValueError('overlap must exceed twice maxShift by at least 8 samples')
+
+        segLen  = self.TraceLength.get() + 1
+        step    = segLen - overlap
+        if step <= 0:
+            raise ValueError(f'overlap {overlap} must be smaller than the trace length {segLen}')
+        nSeg    = max(1, -(-(totalLength - segLen) // step) + 1)
+        cycles  = clocksPerSample * (self.SkipSamples.get() + 1)
+        baseOff = self.TriggerOffset.get()
+        offsets = baseOff + np.round(np.arange(nSeg) * step * cycles).astype(int)
+        if offsets[-1] > 0x1FFF:
+            raise ValueError(f'{totalLength} samples need TriggerOffset {offsets[-1]}, above the 13 bit limit')
+
+        # ArmReg mode gives exactly one trace per arm, no stale traces from the double buffer
+        trigMode = self.TriggerMode.get()
+        if trigMode == 0:
+            raise pr.DeviceError(f'{self.path}: TriggerMode is Never')
+        if trigMode == 3:
+            self.TriggerMode.set(1)
+
+        out  = np.zeros((2, totalLength), dtype='<u2')
+        lags = np.arange(-maxShift, maxShift+1)
+        end  = 0
+        try:
+            for k in range(nSeg):
+                self.TriggerOffset.set(int(offsets[k]))
+                count = self._receiver.traceCount()
+                if trigMode != 2:
+                    self.ArmReg.set(True)
+                seg = self._receiver.waitTrace(timeout, after=count)
+                if seg is None:
+                    raise pr.DeviceError(f'{self.path}: timeout waiting for segment {k}')
+
+                if k == 0:
+                    pos = 0
+                else:
+                    # Mean squared difference between the stitched tail and the segment head for each lag
+                    nominal = k * step
+                    err = np.empty(len(lags))
+                    for i, lag in enumerate(lags):
+                        q = nominal + lag
+                        n = min(end - q, totalLength - q)
+                        d = out[:, q:q+n].astype(np.float64) - seg[:, :n]
+                        err[i] = np.mean(d*d)
+                    pos = nominal + lags[np.argmin(err)]
+
+                n = min(pos + segLen, totalLength) - end
+                if n > 0:
+                    out[:, end:end+n] = seg[:, end-pos:end-pos+n]
+                    end += n
+        finally:
+            self.TriggerOffset.set(baseOff)
+            if trigMode == 3:
+                self.TriggerMode.set(3)
+
+        return out
+
+    def getAverage(self):
+        """Return the running statistics, arrays of shape (2, n)"""
+        with self._accLock:
+            return {
+                'count'    : self._accum.count,
+                'mean'     : self._accum.mean,
+                'variance' : self._accum.variance,
+                'min'      : self._accum.minimum,
+                'max'      : self._accum.maximum,
+            }
 
 
     @staticmethod
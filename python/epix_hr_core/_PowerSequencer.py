@@ -0,0 +1,126 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import threading
+import time
+
+##############################################################
+##
+## Declarative power sequencing, one thread per board
+##
+## A sequence is a list of stages, each a dict with either
+##    'enable': {'DigitalEn': True, 'AnalogEn': True}
+## or
+##    'rails':  {'MVddAsic': 2.5, 'MVdd': 2.5}, optional 'steps'
+## Rails of a stage are ramped together (linear, all rails per
+## step in one setVoltages call). After every step the slow ADC
+## channels in limits are read and checked, a violation aborts
+## the board: supplies off and rails back to the start values.
+##
+##############################################################
+class PowerSequencer(object):
+    def __init__(self, sequence, limits=None, steps=10, stepDelay=0.05, abortFleet=False):
+        self.sequence   = sequence
+        self.limits     = limits if limits is not None else {}
+        self.steps      = steps
+        self.stepDelay  = stepDelay
+        self.abortFleet = abortFleet
+        self.boards     = {}
+        self.results    = {}
+        self._abort     = threading.Event()
+
+    def addBoard(self, name, railDev, powerDev, slowAdcDev=None):
+        """Add a board: ProgrammablePowerSupply(Cryo), powerSupplyRegisters and SlowAdcRegisters"""
+        envVars = {}
+        if slowAdcDev is not None:
+            # EnvData variables carry the AdcChannelEnum name in their description
+            byName = {v.description: v for k, v in slowAdcDev.variables.items() if k.startswith('EnvData')}
+            for ch in self.limits:
+                if ch not in byName:
+                    raise ValueError(f'{slowAdcDev.path}: no slow ADC channel {ch}')
+                envVars[ch] = byName[ch]
+        elif self.limits:
+            raise ValueError(f'Board {name}: limits need a SlowAdcRegisters device')
+        self.boards[name] = (railDev, powerDev, slowAdcDev, envVars)
+
+    def abort(self):
+        """Abort the running sequence on all boards"""
+        self._abort.set()
+
+    def run(self, timeout=None):
+        """Run the sequence on all boards concurrently, return {board: result}"""
+        self._abort.clear()
+        self.results = {}
+        threads = [threading.Thread(target=self._runBoard, args=(name,), name=f'PowerSequencer.{name}')
+                   for name in self.boards]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout)
+        return self.results
+
+    def _check(self, name):
+        railDev, powerDev, slowAdcDev, envVars = self.boards[name]
+        if not envVars:
+            return
+        slowAdcDev.readBlocks(variable=list(envVars.values()))
+        slowAdcDev.checkBlocks(variable=list(envVars.values()))
+        for ch, var in envVars.items():
+            lo, hi = self.limits[ch]
+            value = var.value()
+            if not lo <= value <= hi:
+                raise RuntimeError(f'{ch} = {value} outside [{lo}, {hi}]')
+
+    def _runBoard(self, name):
+        railDev, powerDev, slowAdcDev, envVars = self.boards[name]
+        start = time.time()
+        initial = None
+        result = {'ok': False, 'error': None, 'stage': None, 'time': 0.0}
+        try:
+            initial = railDev.getVoltages()
+            for stageIdx, stage in enumerate(self.sequence):
+                result['stage'] = stageIdx
+                if 'enable' in stage:
+                    for var, en in stage['enable'].items():
+                        powerDev.variables[var].set(en)
+                    self._check(name)
+
+                if 'rails' in stage:
+                    target = stage['rails']
+                    now    = railDev.getVoltages()
+                    nSteps = stage.get('steps', self.steps)
+                    ramp   = {rail: np.linspace(now[rail], v, nSteps + 1)[1:] for rail, v in target.items()}
+                    for k in range(nSteps):
+                        if self._abort.is_set():
+                            raise RuntimeError('aborted')
+                        railDev.setVoltages({rail: ramp[rail][k] for rail in target})
+                        time.sleep(self.stepDelay)
+                        self._check(name)
+            result['ok'] = True
+
+        except Exception as e:
+            result['error'] = str(e)
+            if self.abortFleet:
+                self._abort.set()
+            if initial is not None:
+                result['shutdownError'] = self._shutdown(name, initial)
+
+        result['time'] = time.time() - start
+        self.results[name] = result
+
+    def _shutdown(self, name, initial):
+        railDev, powerDev, slowAdcDev, envVars = self.boards[name]
+        try:
+            powerDev.AnalogEn.set(False)
+            powerDev.DigitalEn.set(False)
+            railDev.setVoltages(initial)
+        except Exception as e:
+            return str(e)
+        return None
@@ -8,8 +8,9 @@
 # contained in the LICENSE.txt file.
 #-----------------------------------------------------------------------------
 import pyrogue     as pr
+import epix_hr_core as epixHrCore
 
-class ProgrammablePowerSupply(pr.Device):
+class ProgrammablePowerSupply(epixHrCore.CalibratedRailDevice):
     def __init__(self, **kwargs):
         super().__init__(description='Slow DAC Registers', **kwargs)
 
@@ -27,19 +28,23 @@ class ProgrammablePowerSupply(pr.Device):
         #Setup registers & variables
 
         self.add((
-            pr.RemoteVariable(name='MVddAsic_dac_0',    description='',                  offset=0x00004, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'),
-            pr.RemoteVariable(name='MVh_dac_1',         description='',                  offset=0x00008, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'),
-            pr.RemoteVariable(name='MVbias_dac_2',      description='',                  offset=0x0000c, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'),
-            pr.RemoteVariable(name='MVm_dac_3',         description='',                  offset=0x00010, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'),
-            pr.RemoteVariable(name='MVdd_det_dac_4',    description='',                  offset=0x00014, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'))
-        )
-        self.add((
-            pr.LinkVariable  (name='MVddAsic' ,         linkedGet=self.convtFloatP10p0,   dependencies=[self.MVddAsic_dac_0]),
-            pr.LinkVariable  (name='MVh' ,              linkedGet=self.convtFloatP7p0,    dependencies=[self.MVh_dac_1]),
-            pr.LinkVariable  (name='MVbias' ,           linkedGet=self.convtFloatP7p0,    dependencies=[self.MVbias_dac_2]),
-            pr.LinkVariable  (name='MVm' ,              linkedGet=self.convtFloatM2p5,    dependencies=[self.MVm_dac_3]),
-            pr.LinkVariable  (name='MVdd' ,             linkedGet=self.convtFloatP10p0,   dependencies=[self.MVdd_det_dac_4]))
+            pr.RemoteVariable(name='MVddAsic_dac_0',    description='',                  offset=0x00004, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True),
+            pr.RemoteVariable(name='MVh_dac_1',         description='',                  offset=0x00008, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True),
+            pr.RemoteVariable(name='MVbias_dac_2',      description='',                  offset=0x0000c, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True),
+            pr.RemoteVariable(name='MVm_dac_3',         description='',                  offset=0x00010, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True),
+            pr.RemoteVariable(name='MVdd_det_dac_4',    description='',                  offset=0x00014, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True))
         )
+        # Numeric volts with reverse setters, calibration={'MVh': (gain, offset), ...} per board
+        self.addRail('MVddAsic',  self.MVddAsic_dac_0,   10.0/65536.0)
+        self.addRail('MVh',       self.MVh_dac_1,         7.0/65536.0)
+        self.addRail('MVbias',    self.MVbias_dac_2,      7.0/65536.0)
+        self.addRail('MVm',       self.MVm_dac_3,        -2.5/65536.0)
+        self.addRail('MVdd',      self.MVdd_det_dac_4,   10.0/65536.0)
+
+        # The five DAC words as one block, getVoltages() / setVoltages() use a single transaction
+        self.add(pr.RemoteVariable(name='dacArray', description='All DAC words', offset=0x00004, numValues=5, valueBits=16, valueStride=32,
+                                   base=pr.UInt, mode='RW', overlapEn=True, hidden=True))
+        self.setRailArray(self.dacArray, ['MVddAsic', 'MVh', 'MVbias', 'MVm', 'MVdd'])
 
 
         #####################################
@@ -53,27 +58,6 @@ class ProgrammablePowerSupply(pr.Device):
         # The command object and the arg are passed
 
 
-    @staticmethod
-    def convtFloatP10p0(dev, var):
-        value   = var.dependencies[0].get(read=False)
-        fpValue = value*(10.0/65536.0)
-        return '%0.3f'%(fpValue)
-
-
-    @staticmethod
-    def convtFloatM2p5(dev, var):
-        value   = var.dependencies[0].get(read=False)
-        fpValue = value*(-2.5/65536.0)
-        return '%0.3f'%(fpValue)
-
-
-    @staticmethod
-    def convtFloatP7p0(dev, var):
-        value   = var.dependencies[0].get(read=False)
-        fpValue = value*(7.0/65536.0)
-        return '%0.3f'%(fpValue)
-
-
     @staticmethod
     def frequencyConverter(self):
         def func(dev, var):
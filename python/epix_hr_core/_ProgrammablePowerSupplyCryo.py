@@ -8,8 +8,9 @@
 # contained in the LICENSE.txt file.
 #-----------------------------------------------------------------------------
 import pyrogue     as pr
+import epix_hr_core as epixHrCore
 
-class ProgrammablePowerSupplyCryo(pr.Device):
+class ProgrammablePowerSupplyCryo(epixHrCore.CalibratedRailDevice):
     def __init__(self, **kwargs):
         super().__init__(description='Two channel programmable power supply', **kwargs)
 
@@ -27,13 +28,17 @@ class ProgrammablePowerSupplyCryo(pr.Device):
         #Setup registers & variables
 
         self.add((
-            pr.RemoteVariable(name='Vdd1',    description='',                  offset=0x00004, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'),
-            pr.RemoteVariable(name='Vdd2',    description='',                  offset=0x00008, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW'))
-        )
-        self.add((
-            pr.LinkVariable  (name='Vdd1_V',         linkedGet=self.convtFloatP5p0,    dependencies=[self.Vdd1]),
-            pr.LinkVariable  (name='Vdd2_V',         linkedGet=self.convtFloatP5p0,    dependencies=[self.Vdd2]))
+            pr.RemoteVariable(name='Vdd1',    description='',                  offset=0x00004, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True),
+            pr.RemoteVariable(name='Vdd2',    description='',                  offset=0x00008, bitSize=16,   bitOffset=0,   base=pr.UInt, disp = '{:#x}', mode='RW', overlapEn=True))
         )
+        # Numeric volts with reverse setters, calibration={'Vdd1_V': (gain, offset), ...} per board
+        self.addRail('Vdd1_V', self.Vdd1, 5.0/65536.0)
+        self.addRail('Vdd2_V', self.Vdd2, 5.0/65536.0)
+
+        # Both DAC words as one block, getVoltages() / setVoltages() use a single transaction
+        self.add(pr.RemoteVariable(name='dacArray', description='All DAC words', offset=0x00004, numValues=2, valueBits=16, valueStride=32,
+                                   base=pr.UInt, mode='RW', overlapEn=True, hidden=True))
+        self.setRailArray(self.dacArray, ['Vdd1_V', 'Vdd2_V'])
 
 
         #####################################
@@ -47,12 +52,6 @@ class ProgrammablePowerSupplyCryo(pr.Device):
         # The command object and the arg are passed
 
 
-    @staticmethod
-    def convtFloatP5p0(dev, var):
-        value   = var.dependencies[0].get(read=False)
-        fpValue = value*(5.0/65536.0)
-        return '%0.3f'%(fpValue)
-
     @staticmethod
     def frequencyConverter(self):
         def func(dev, var):
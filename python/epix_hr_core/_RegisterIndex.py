@@ -0,0 +1,178 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import json
+
+from epix_hr_core._RegisterSnapshot import RegisterSnapshot, INDEX_DTYPE, _decodable, _indexRows, _decode
+
+##############################################################
+##
+## Static register map index
+##
+## generate() instantiates device classes stand alone (no root,
+## no memory base) and writes the layout of every remote
+## variable to a JSON file:
+##    name, offset, bitOffset, bitSize, base, mode
+##    (+ numValues, valueBits, valueStride for arrays)
+## Offline tools only need numpy and that file: load() returns
+## a RegisterIndex which builds the RegisterSnapshot index rows
+## and a structured dtype. Its extractor decodes, with the
+## RegisterSnapshot decoder, raw 32 bit word dumps of the device
+## (one row per dump) or saved RegisterSnapshot files into
+## structured records.
+##
+##############################################################
+class RegisterIndex(object):
+    def __init__(self, name, entries):
+        self.name    = name
+        self.entries = entries
+
+    @classmethod
+    def fromDevice(cls, dev):
+        """Index of the remote variables of an instantiated device, offsets relative to it"""
+        import pyrogue as pr
+        entries = []
+        for var in dev.variableList:
+            if not isinstance(var, pr.RemoteVariable):
+                continue
+            entries.append({
+                'name':        var.path[len(dev.path) + 1:],
+                'offset':      var.address - dev.address,
+                'bitOffset':   list(var.bitOffset),
+                'bitSize':     list(var.bitSize),
+                'base':        type(var._base).__name__,
+                'mode':        var.mode,
+                'numValues':   getattr(var, '_numValues', 0),
+                'valueBits':   getattr(var, '_valueBits', 0),
+                'valueStride': getattr(var, '_valueStride', 0),
+            })
+        entries.sort(key=lambda e: (e['offset'], e['bitOffset'][0]))
+        return cls(type(dev).__name__, entries)
+
+    @classmethod
+    def fromClass(cls, devClass, **kwargs):
+        """Instantiate a device class stand alone and index it"""
+        return cls.fromDevice(devClass(name=devClass.__name__, **kwargs))
+
+    @staticmethod
+    def generate(path, classes=None):
+        """Write the index of every device class (default: all epix_hr_core devices) to a JSON file
+
+        classes is a list of classes or (class, kwargs) tuples. Returns the indexed
+        class names and {class name: error} of the classes that failed to instantiate.
+        """
+        import pyrogue as pr
+        import epix_hr_core as epixHrCore
+        log = pr.logInit(name='RegisterIndex')
+        if classes is None:
+            classes = [getattr(epixHrCore, n) for n in epixHrCore.__all__]
+            classes = [c for c in classes if isinstance(c, type) and issubclass(c, pr.Device)]
+
+        out, failed = {}, {}
+        for c in classes:
+            c, kwargs = c if isinstance(c, tuple) else (c, {})
+            try:
+                idx = RegisterIndex.fromClass(c, **kwargs)
+            except Exception as e:
+                log.warning(f'{c.__name__} not indexed: {e}')
+                failed[c.__name__] = str(e)
+                continue
+            if idx.entries:
+                out[idx.name] = idx.entries
+
+        with open(path, 'w') as f:
+            json.dump(out, f, indent=1)
+        return list(out), failed
+
+    @classmethod
+    def load(cls, path, name):
+        with open(path) as f:
+            return cls(name, json.load(f)[name])
+
+    @property
+    def numWords(self):
+        """Number of 32 bit words spanned by the register map"""
+        last = 0
+        for e in self.entries:
+            if e['numValues']:
+                bits = e['bitOffset'][0] + (e['numValues'] - 1) * e['valueStride'] + e['valueBits']
+            else:
+                bits = e['bitOffset'][-1] + e['bitSize'][-1]
+            last = max(last, e['offset'] * 8 + bits)
+        return (last + 31) // 32
+
+    @staticmethod
+    def _supported(e):
+        return _decodable(e['base'], e['valueBits'] if e['numValues'] else sum(e['bitSize']))
+
+    @property
+    def skipped(self):
+        """Variables left out of dtype() and extractor(), their base is not decoded"""
+        return [e['name'] for e in self.entries if not self._supported(e)]
+
+    def _entries(self, names=None):
+        return [e for e in self.entries if (names is None or e['name'] in names) and self._supported(e)]
+
+    def index(self, names=None, address=0):
+        """(INDEX_DTYPE rows, names, bases) of the variables, the device at address"""
+        entries = self._entries(names)
+        rows = []
+        for i, e in enumerate(entries):
+            rows.extend(_indexRows(i, address + e['offset'], e['bitOffset'], e['bitSize'], e['numValues'], e['valueBits'], e['valueStride']))
+        return (np.array(rows, dtype=INDEX_DTYPE), np.array([e['name'] for e in entries]),
+                np.array([e['base'] for e in entries]))
+
+    @staticmethod
+    def _fieldType(base, size):
+        if base == 'Bool':
+            return np.bool_
+        if base in ('Float', 'Double'):
+            return np.dtype(f'f{size // 8}')
+        if base == 'String':
+            return np.dtype(f'U{(size + 7) // 8}')
+        if size > 64:
+            return object
+        return np.dtype('i8' if base == 'Int' else 'u8')
+
+    def dtype(self, names=None):
+        """Structured dtype with one field per variable (sub-array for array variables)"""
+        fields = []
+        for e in self._entries(names):
+            if e['numValues']:
+                fields.append((e['name'], self._fieldType(e['base'], e['valueBits']), (e['numValues'],)))
+            else:
+                fields.append((e['name'], self._fieldType(e['base'], sum(e['bitSize']))))
+        return np.dtype(fields)
+
+    def extractor(self, names=None):
+        """Return f(data, address=0) -> structured array, one record per dump
+
+        data is a dense word dump of the device, (N, numWords) or (numWords,) uint32 starting
+        at the device, or a RegisterSnapshot (dict or npz file name) with its rangeAddress /
+        rangeWords, address is then the address of the device in the snapshot.
+        """
+        dtype = self.dtype(names)
+
+        def extract(data, address=0):
+            index, vnames, bases = self.index(names, address)
+            if isinstance(data, str):
+                data = RegisterSnapshot.load(data)
+            if isinstance(data, dict):
+                words, rangeAddress, rangeWords = data['words'], data['rangeAddress'], data['rangeWords']
+            else:
+                words = np.atleast_2d(np.asarray(data, dtype=np.uint32))
+                rangeAddress, rangeWords = [address], [words.shape[1]]
+            values = _decode(words, index, vnames, bases, rangeAddress, rangeWords)
+            out = np.zeros(len(np.atleast_2d(words)), dtype=dtype)
+            for name, value in values.items():
+                out[name] = value
+            return out
+
+        return extract
@@ -0,0 +1,216 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import time
+
+##############################################################
+##
+## Raw register snapshot
+##
+## The readable remote variables of a device tree are merged
+## into contiguous address ranges (per device, at most maxBytes
+## each). A snapshot reads every range once with a raw block
+## read and keeps the 32 bit words as they are. The register
+## index (one row per bit field) is saved next to the words so
+## decode() can rebuild the named values offline, without
+## pyrogue, for all fields at once. RegisterIndex builds the
+## same index rows from its JSON layout and uses the same
+## decoder for dense dumps and saved snapshots.
+##
+##############################################################
+
+# One row per contiguous bit field of a variable
+INDEX_DTYPE = np.dtype([
+    ('var',       np.int32),   # row in the names array
+    ('address',   np.uint64),  # byte address of the variable
+    ('bitOffset', np.uint32),  # bit offset from address
+    ('bitSize',   np.uint32),
+    ('valueIdx',  np.int32),   # element of an array variable, -1 for scalars
+    ('shift',     np.uint32),  # bit position of this field in the value
+])
+
+DECODE_BASES = ('UInt', 'Int', 'Bool', 'Float', 'Double', 'String')
+
+class RegisterSnapshot(object):
+    def __init__(self, device, maxBytes=4096, exclude=()):
+        # pyrogue is only needed to take snapshots, decode() runs without it
+        import pyrogue as pr
+        self._device = device
+        names, bases, rows, spans = [], [], [], {}
+        self.skipped = []
+
+        for var in device.variableList:
+            if not isinstance(var, pr.RemoteVariable) or var.mode == 'WO':
+                continue
+            if any(e in var.path for e in exclude):
+                continue
+
+            # Only bases decode() understands enter the index, the others are listed in skipped
+            base = type(var._base).__name__
+            numValues = getattr(var, '_numValues', 0)
+            size = var._valueBits if numValues else sum(var.bitSize)
+            if not _decodable(base, size):
+                self.skipped.append(var.path)
+                continue
+
+            rows.extend(_indexRows(len(names), var.address, var.bitOffset, var.bitSize,
+                                   numValues, getattr(var, '_valueBits', 0), getattr(var, '_valueStride', 0)))
+            names.append(var.path)
+            bases.append(base)
+
+            spans.setdefault(var.parent, []).append((var.address, var.address + var.varBytes))
+
+        self.names = np.array(names)
+        self.bases = np.array(bases)
+        self.index = np.array(rows, dtype=INDEX_DTYPE)
+        self.ranges = []
+
+        # Merge the byte spans of every device into word aligned ranges
+        for dev, devSpans in spans.items():
+            devSpans.sort()
+            start, stop = None, None
+            for lo, hi in devSpans:
+                lo &= ~0x3
+                hi = (hi + 3) & ~0x3
+                if start is not None and lo <= stop and max(stop, hi) - start <= maxBytes:
+                    stop = max(stop, hi)
+                    continue
+                if start is not None:
+                    self.ranges.append((dev, start, stop))
+                start, stop = lo, hi
+            if start is not None:
+                self.ranges.append((dev, start, stop))
+        self.ranges.sort(key=lambda r: r[1])
+
+    def take(self):
+        """Read every range once, return {'time', 'rangeAddress', 'rangeWords', 'words'}"""
+        words = []
+        for dev, start, stop in self.ranges:
+            data = dev._rawRead(offset=start - dev.address, numWords=(stop - start) // 4)
+            words.append(np.atleast_1d(np.asarray(data, dtype=np.uint32)))
+        return {
+            'time':         time.time(),
+            'rangeAddress': np.array([r[1] for r in self.ranges], dtype=np.uint64),
+            'rangeWords':   np.array([len(w) for w in words], dtype=np.uint32),
+            'words':        np.concatenate(words) if words else np.zeros(0, dtype=np.uint32),
+        }
+
+    def save(self, path, snap=None):
+        """Take (or use) a snapshot and write it with the register index to a npz file"""
+        if snap is None:
+            snap = self.take()
+        np.savez(path, names=self.names, bases=self.bases, index=self.index, **snap)
+        return snap
+
+    @staticmethod
+    def load(path):
+        with np.load(path) as f:
+            return {k: f[k] for k in f.files}
+
+    @staticmethod
+    def decode(snap, names=None):
+        """Decode a snapshot (dict or npz file name) into {path: value}, numpy only"""
+        if isinstance(snap, str):
+            snap = RegisterSnapshot.load(snap)
+        index = snap['index']
+        if names is not None:
+            index = index[np.isin(index['var'], np.flatnonzero(np.isin(snap['names'], names)))]
+        values = _decode(snap['words'], index, snap['names'], snap['bases'], snap['rangeAddress'], snap['rangeWords'])
+        return {name: value[0].item() if isinstance(value[0], np.generic) else value[0] for name, value in values.items()}
+
+def _decodable(base, size):
+    """True when _convert() handles values of this base and bit size"""
+    return base in DECODE_BASES and (base not in ('Float', 'Double') or size in (32, 64))
+
+def _indexRows(var, address, bitOffset, bitSize, numValues=0, valueBits=0, valueStride=0):
+    """INDEX_DTYPE rows of a variable: one per element of an array, one per bit field of a scalar"""
+    if numValues:
+        return [(var, address, bitOffset[0] + i * valueStride, valueBits, i, 0) for i in range(numValues)]
+    rows, shift = [], 0
+    for bo, bs in zip(bitOffset, bitSize):
+        rows.append((var, address, bo, bs, -1, shift))
+        shift += bs
+    return rows
+
+def _decode(words, index, names, bases, rangeAddress, rangeWords):
+    """Decode the index rows from words (one row per dump of the ranges) into {name: array of values}
+
+    Array variables give one (dumps, numValues) array, scalars one value per dump.
+    """
+    words = np.atleast_2d(np.asarray(words, dtype=np.uint32))
+    nDumps, nWords = words.shape
+    rangeAddr  = np.asarray(rangeAddress).astype(np.int64)
+    rangeBytes = np.asarray(rangeWords).astype(np.int64) * 4
+    rangeStart = np.concatenate([[0], np.cumsum(rangeBytes)[:-1]])
+    if rangeBytes.sum() != nWords * 4:
+        raise ValueError(f'{nWords} words per dump, the ranges hold {rangeBytes.sum() // 4}')
+
+    # Bit position of every field in the concatenated ranges
+    address = index['address'].astype(np.int64)
+    r = np.searchsorted(rangeAddr, address, side='right') - 1
+    outside = (r < 0) | (address >= rangeAddr[r] + rangeBytes[r])
+    if np.any(outside):
+        raise ValueError(f'Addresses {[hex(a) for a in np.unique(address[outside])[:10]]} are outside the dumped ranges')
+    pos = (rangeStart[r] + address - rangeAddr[r]) * 8 + index['bitOffset']
+
+    # Little endian byte image of all the dumps, gather every field of every dump at once
+    buf  = np.concatenate([words.astype('<u4').view(np.uint8).ravel(), np.zeros(8, dtype=np.uint8)])
+    pos  = (pos[None, :] + np.arange(nDumps, dtype=np.int64)[:, None] * (nWords * 32)).ravel()
+    size = np.tile(index['bitSize'].astype(np.int64), nDumps)
+    value = _extract(buf, pos, size).reshape(nDumps, len(index))
+
+    out = {}
+    valueIdx = index['valueIdx']
+    for v in np.unique(index['var']):
+        rows = np.flatnonzero(index['var'] == v)
+        name, base = str(names[v]), str(bases[v])
+        if valueIdx[rows[0]] >= 0:
+            rows = rows[np.argsort(valueIdx[rows])]
+            out[name] = _convert(value[:, rows], int(index['bitSize'][rows[0]]), base)
+        else:
+            total = np.zeros(nDumps, dtype=object)
+            for row in rows:
+                total = total | (value[:, row] << int(index['shift'][row]))
+            out[name] = _convert(total, int(index['bitSize'][rows].sum()), base)
+    return out
+
+def _extract(buf, pos, size):
+    """Extract little endian bit fields (pos, size in bits) from a byte array, as python ints"""
+    byte  = pos // 8
+    bit   = (pos % 8).astype(np.uint64)
+    value = np.zeros(len(pos), dtype=object)
+    narrow = size <= 56
+
+    # Narrow fields: one 8 byte gather and a shift/mask per field
+    lanes = byte[narrow, None] + np.arange(8)
+    word  = (buf[lanes].astype(np.uint64) << (np.arange(8, dtype=np.uint64) * np.uint64(8))).sum(axis=1, dtype=np.uint64)
+    mask  = (np.uint64(1) << size[narrow].astype(np.uint64)) - np.uint64(1)
+    value[narrow] = ((word >> bit[narrow]) & mask).tolist()
+
+    for i in np.flatnonzero(~narrow):
+        nBytes = (int(bit[i]) + int(size[i]) + 7) // 8
+        raw = int.from_bytes(buf[byte[i]:byte[i] + nBytes].tobytes(), 'little')
+        value[i] = (raw >> int(bit[i])) & ((1 << int(size[i])) - 1)
+    return value
+
+def _convert(value, size, base):
+    """Raw field values (object array of python ints) to the type of the variable base"""
+    if base in ('Float', 'Double'):
+        return value.astype(np.uint64).astype(f'u{size // 8}').view(np.float32 if size == 32 else np.float64)
+    if base == 'String':
+        return np.frompyfunc(lambda v: int(v).to_bytes((size + 7) // 8, 'little').split(b'\0', 1)[0].decode(errors='replace'), 1, 1)(value)
+    if base == 'Bool':
+        return value.astype(bool)
+    if base == 'Int':
+        if size > 64:
+            return np.where(value >= (1 << (size - 1)), value - (1 << size), value)
+        # Sign extension with an arithmetic shift
+        return (value.astype(np.uint64) << np.uint64(64 - size)).view(np.int64) >> np.int64(64 - size)
+    return value.astype(np.uint64) if size <= 64 else value
@@ -0,0 +1,153 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import numpy     as np
+import threading
+import time
+
+##############################################################
+##
+## Stream receiver for the SlowAdcStream frames
+##
+## Frame layout (32 bit words, see SlowAdcStream.vhd):
+##    header   (word 0 = lane/VC, word 1 = quad/opcode/acqCount, word 2 = seqCount)
+##    8 channel words, EnvData 0-5,7,8 (channel 6 is not sent)
+##    1 footer word
+##
+##############################################################
+class SlowAdcReceiver(pr.DataReceiver):
+
+    SLOW_ADC_VC  = 3
+    CHANNEL_MAP  = [0, 1, 2, 3, 4, 5, 7, 8]
+    MIN_SIZE     = (3 + 8 + 1) * 4
+
+    def __init__(self, AdcChannelEnum = [], batchSize=64, historyLen=65536, expectedPeriod=None, **kwargs):
+        super().__init__(description='Slow ADC environmental data stream receiver', hideData=True, **kwargs)
+
+        if not AdcChannelEnum:
+            AdcChannelEnum = ["Temp1", "Temp2", "Humidity", "AsicAnalogCurr", "AsicDigitalCurr", "AsicVguardCurr", "Unused", "AnalogVin","DigitalVin" ]
+
+        self.channelNames = list(AdcChannelEnum)
+        self.dtype = np.dtype([('timestamp', 'f8'), ('seqCount', 'u4'), ('acqCount', 'u2')] +
+                              [(name, 'i4') for name in self.channelNames])
+
+        # expectedPeriod is the StreamPeriod in seconds, frames further apart than 1.5 periods count as a gap
+        self._expectedPeriod = expectedPeriod
+        self._batchSize = batchSize
+        self._raw       = np.zeros((batchSize, 11), dtype='<u4')
+        self._rawTime   = np.zeros(batchSize)
+        self._nRaw      = 0
+        self._history   = np.zeros(historyLen, dtype=self.dtype)
+        self._nHist     = 0
+        self._lastSeq   = None
+        self._lastTime  = None
+        self._lock      = threading.Lock()
+        self._listeners = []
+
+        self.add(pr.LocalVariable(name='SampleCount',   description='Decoded samples',                 mode='RO', value=0, disp='{}', pollInterval=1))
+        self.add(pr.LocalVariable(name='GapCount',      description='Detected sequence or time gaps',  mode='RO', value=0, disp='{}', pollInterval=1))
+        self.add(pr.LocalVariable(name='BadFrameCount', description='Frames with bad header or length', mode='RO', value=0, disp='{}', pollInterval=1))
+
+    def countReset(self):
+        super().countReset()
+        self.SampleCount.set(0, write=False)
+        self.GapCount.set(0, write=False)
+        self.BadFrameCount.set(0, write=False)
+
+    def addListener(self, func):
+        """Register func(batch) called with each decoded structured array batch"""
+        self._listeners.append(func)
+
+    def process(self, frame):
+        size = frame.getPayload()
+        if (size % 4) != 0 or size < self.MIN_SIZE:
+            with self.BadFrameCount.lock:
+                self.BadFrameCount.set(self.BadFrameCount.value() + 1, write=False)
+            return
+
+        with self._lock:
+            # Header words, then the 8 channel words ahead of the footer
+            row = self._raw[self._nRaw]
+            frame.read(row[0:3], 0)
+            if (row[0] & 0x3) != self.SLOW_ADC_VC:
+                with self.BadFrameCount.lock:
+                    self.BadFrameCount.set(self.BadFrameCount.value() + 1, write=False)
+                return
+            frame.read(row[3:11], size - 36)
+            self._rawTime[self._nRaw] = time.time()
+            self._nRaw += 1
+            full = self._nRaw == self._batchSize
+
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Decode the buffered frames and return them as a structured array"""
+        with self._lock:
+            n = self._nRaw
+            if n == 0:
+                return np.zeros(0, dtype=self.dtype)
+            raw = self._raw[:n]
+
+            batch = np.zeros(n, dtype=self.dtype)
+            batch['timestamp'] = self._rawTime[:n]
+            batch['acqCount']  = raw[:, 1] & 0xFFFF
+            batch['seqCount']  = raw[:, 2]
+            data = raw[:, 3:11].view('<i4')
+            for i, ch in enumerate(self.CHANNEL_MAP):
+                batch[self.channelNames[ch]] = data[:, i]
+            self._nRaw = 0
+
+            gaps = self._countGaps(batch)
+
+            # Columnar history ring
+            depth = self._history.shape[0]
+            keep  = min(n, depth)
+            idx = np.arange(self._nHist + n - keep, self._nHist + n) % depth
+            self._history[idx] = batch[n-keep:]
+            self._nHist += n
+
+        for func in self._listeners:
+            func(batch)
+
+        with self.SampleCount.lock:
+            self.SampleCount.set(self.SampleCount.value() + n, write=False)
+        if gaps:
+            with self.GapCount.lock:
+                self.GapCount.set(self.GapCount.value() + gaps, write=False)
+        self.Updated.set(True, write=False)
+        return batch
+
+    def _countGaps(self, batch):
+        seq = batch['seqCount'].astype(np.int64)
+        ts  = batch['timestamp']
+        if self._lastSeq is not None:
+            seq = np.concatenate(([self._lastSeq], seq))
+            ts  = np.concatenate(([self._lastTime], ts))
+        self._lastSeq  = int(seq[-1])
+        self._lastTime = float(ts[-1])
+
+        # The sequence counter is only used when the firmware drives it
+        gaps = np.zeros(len(seq) - 1, dtype=bool)
+        if np.any(seq != 0):
+            gaps |= (np.diff(seq) % (1 << 32)) != 1
+        if self._expectedPeriod is not None:
+            gaps |= np.diff(ts) > 1.5 * self._expectedPeriod
+        return int(np.count_nonzero(gaps))
+
+    def getData(self, count=None):
+        """Return the last count decoded samples (oldest first) as a structured array"""
+        with self._lock:
+            depth = self._history.shape[0]
+            avail = min(self._nHist, depth)
+            if count is None or count > avail:
+                count = avail
+            idx = np.arange(self._nHist - count, self._nHist) % depth
+            return self._history[idx]
@@ -0,0 +1,73 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy     as np
+import json
+import os
+
+##############################################################
+##
+## Resumable sweep state on disk
+##
+## The result matrices of a sweep are memory mapped .npy files
+## (one column per step), completed steps are appended to a
+## journal. A step only enters the journal after its columns
+## are flushed, so after a crash, timeout or Ctrl-C the sweep
+## restarts after the last journaled step. A checkpoint made
+## with different parameters (meta) is discarded.
+##
+##############################################################
+class SweepCheckpoint(object):
+    def __init__(self, path, names, shape, meta=None):
+        self.path  = path
+        self.names = names
+        meta = dict(meta or {}, shape=list(shape), names=list(names))
+
+        resume = os.path.exists(self._file('json')) and os.path.exists(self._file('journal'))
+        if resume:
+            with open(self._file('json')) as f:
+                resume = json.load(f) == meta
+        if not resume:
+            self.remove()
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            with open(self._file('json'), 'w') as f:
+                json.dump(meta, f)
+            open(self._file('journal'), 'wb').close()
+
+        mode = 'r+' if resume else 'w+'
+        self.arrays = {n: np.lib.format.open_memmap(self._file(f'{n}.npy'), mode=mode, dtype=np.float64, shape=tuple(shape))
+                       for n in names}
+        self.done = set(np.fromfile(self._file('journal'), dtype=np.int32).tolist())
+        self._journal = open(self._file('journal'), 'ab')
+
+    def _file(self, ext):
+        return f'{self.path}.{ext}'
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def mark(self, step):
+        """Flush the arrays and journal step as completed"""
+        for a in self.arrays.values():
+            a.flush()
+        self._journal.write(np.int32(step).tobytes())
+        self._journal.flush()
+        os.fsync(self._journal.fileno())
+        self.done.add(step)
+
+    def close(self):
+        self._journal.close()
+        for a in self.arrays.values():
+            a.flush()
+
+    def remove(self):
+        """Delete the checkpoint files"""
+        for ext in ['json', 'journal'] + [f'{n}.npy' for n in self.names]:
+            if os.path.exists(self._file(ext)):
+                os.remove(self._file(ext))
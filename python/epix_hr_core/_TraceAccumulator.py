@@ -0,0 +1,91 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import numpy as np
+
+##############################################################
+##
+## Per sample running mean, variance and min/max envelopes
+##
+##############################################################
+class TraceAccumulator(object):
+    def __init__(self, shape=None):
+        self.count = 0
+        self._shape = None
+        if shape is not None:
+            self.reset(shape)
+
+    def reset(self, shape=None):
+        """Clear the statistics, reallocating the buffers when shape changes"""
+        if shape is not None and tuple(shape) != self._shape:
+            self._shape = tuple(shape)
+            self._mean  = np.zeros(self._shape)
+            self._m2    = np.zeros(self._shape)
+            self._min   = np.zeros(self._shape)
+            self._max   = np.zeros(self._shape)
+            self._delta = np.zeros(self._shape)
+            self._x     = np.zeros(self._shape)
+        self.count = 0
+        if self._shape is not None:
+            self._mean.fill(0)
+            self._m2.fill(0)
+            self._min.fill(np.inf)
+            self._max.fill(-np.inf)
+
+    def add(self, trace):
+        """Add one trace (Welford update, no allocation)"""
+        if self._shape is None or np.shape(trace) != self._shape:
+            self.reset(np.shape(trace))
+        x = self._x
+        d = self._delta
+        x[...] = trace
+        self.count += 1
+        np.subtract(x, self._mean, out=d)
+        self._mean += d / self.count
+        np.subtract(x, self._mean, out=x)
+        d *= x
+        self._m2 += d
+        np.minimum(self._min, trace, out=self._min)
+        np.maximum(self._max, trace, out=self._max)
+
+    def addBatch(self, traces):
+        """Add a batch of traces, shape (n, ...), merging with Chan's parallel update"""
+        traces = np.asarray(traces, dtype=np.float64)
+        n = traces.shape[0]
+        if n == 0:
+            return
+        if self._shape is None or traces.shape[1:] != self._shape:
+            self.reset(traces.shape[1:])
+        bMean = traces.mean(axis=0)
+        bM2   = ((traces - bMean)**2).sum(axis=0)
+        total = self.count + n
+        delta = bMean - self._mean
+        self._mean += delta * (n / total)
+        self._m2   += bM2 + delta**2 * (self.count * n / total)
+        self.count  = total
+        np.minimum(self._min, traces.min(axis=0), out=self._min)
+        np.maximum(self._max, traces.max(axis=0), out=self._max)
+
+    @property
+    def mean(self):
+        return self._mean.copy()
+
+    @property
+    def variance(self):
+        if self.count < 2:
+            return np.zeros(self._shape)
+        return self._m2 / (self.count - 1)
+
+    @property
+    def minimum(self):
+        return self._min.copy()
+
+    @property
+    def maximum(self):
+        return self._max.copy()
@@ -0,0 +1,174 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import pyrogue   as pr
+import rogue.interfaces.memory as rim
+import threading
+import json
+import time
+
+##############################################################
+##
+## Register transaction profiler
+##
+## While enabled, pr.startTransaction / pr.checkTransaction
+## (used by every readBlocks / writeBlocks / verifyBlocks, so
+## by every variable get and set) and BaseCommand.__call__ are
+## wrapped. Each block transaction is counted per command, block
+## and type, its latency (start to check) goes into a log2
+## histogram in microseconds. A read of a block that was read
+## less than redundantWindow seconds before, with no write to
+## its device in between, is counted as redundant.
+##
+## Only dict updates are done per transaction, it can stay on.
+##
+##############################################################
+
+_TYPES = {rim.Read: 'Read', rim.Write: 'Write', rim.Post: 'Post', rim.Verify: 'Verify'}
+
+class TransactionProfiler(object):
+    _active = None
+
+    def __init__(self, redundantWindow=0.01):
+        self.redundantWindow = redundantWindow
+        self._lock  = threading.Lock()
+        self._local = threading.local()
+        self._orig  = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.counts    = {}   # (command, block, type) -> count
+            self.hist      = {}   # (block, type) -> {log2 bucket: count}
+            self.latency   = {}   # (block, type) -> total seconds
+            self.redundant = {}   # (command, block) -> count
+            self._pending  = {}   # id(block) -> [(start, block, type), ...] started since its last check
+            self._lastRead = {}   # block -> time
+            self._lastWr   = {}   # device path -> time
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *args):
+        self.disable()
+
+    def enable(self):
+        """Install the wrappers, only one profiler can be active"""
+        if TransactionProfiler._active is not None:
+            raise RuntimeError('A TransactionProfiler is already enabled')
+        TransactionProfiler._active = self
+        self._orig = (pr.startTransaction, pr.checkTransaction, pr.BaseCommand.__call__)
+        start, check, call = self._orig
+
+        def startTransaction(block, *args, **kwargs):
+            self._start(block, kwargs.get('type', args[0] if args else None))
+            return start(block, *args, **kwargs)
+
+        def checkTransaction(block, *args, **kwargs):
+            try:
+                return check(block, *args, **kwargs)
+            finally:
+                self._check(block)
+
+        def __call__(cmd, *args, **kwargs):
+            stack = self._stack()
+            stack.append(cmd.path)
+            try:
+                return call(cmd, *args, **kwargs)
+            finally:
+                stack.pop()
+
+        pr.startTransaction   = startTransaction
+        pr.checkTransaction   = checkTransaction
+        pr.BaseCommand.__call__ = __call__
+
+    def disable(self):
+        if self._orig is not None:
+            pr.startTransaction, pr.checkTransaction, pr.BaseCommand.__call__ = self._orig
+            self._orig = None
+        TransactionProfiler._active = None
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _start(self, block, type):
+        now  = time.perf_counter()
+        name = getattr(block, 'path', hex(getattr(block, 'address', 0)))
+        tname = _TYPES.get(type, str(type))
+        stack = self._stack()
+        cmd  = stack[-1] if stack else ''
+        dev  = name.rsplit('.', 1)[0]
+
+        with self._lock:
+            key = (cmd, name, tname)
+            self.counts[key] = self.counts.get(key, 0) + 1
+            # A verified set starts a Write and a Verify on the block before one check
+            self._pending.setdefault(id(block), []).append((now, name, tname))
+            if tname == 'Read':
+                last = self._lastRead.get(name)
+                if last is not None and now - last < self.redundantWindow and self._lastWr.get(dev, 0) < last:
+                    self.redundant[(cmd, name)] = self.redundant.get((cmd, name), 0) + 1
+                self._lastRead[name] = now
+            elif tname in ('Write', 'Post'):
+                self._lastWr[dev] = now
+
+    def _check(self, block):
+        now = time.perf_counter()
+        with self._lock:
+            for start, name, tname in self._pending.pop(id(block), []):
+                dt  = now - start
+                key = (name, tname)
+                bucket = int(dt * 1e6).bit_length()
+                h = self.hist.setdefault(key, {})
+                h[bucket] = h.get(bucket, 0) + 1
+                self.latency[key] = self.latency.get(key, 0.0) + dt
+
+    def summary(self):
+        """Per block and type: count, total and mean latency, redundant reads"""
+        with self._lock:
+            out = {}
+            for (cmd, name, tname), n in self.counts.items():
+                e = out.setdefault((name, tname), {'count': 0, 'redundant': 0})
+                e['count'] += n
+            for (cmd, name), n in self.redundant.items():
+                out[(name, 'Read')]['redundant'] += n
+            for key, e in out.items():
+                # The mean is over the transactions checked so far, not the ones still in flight
+                e['hist']  = dict(sorted(self.hist.get(key, {}).items()))
+                e['timed'] = sum(e['hist'].values())
+                e['time']  = self.latency.get(key, 0.0)
+                e['mean']  = e['time'] / e['timed'] if e['timed'] else 0.0
+            return out
+
+    def report(self, top=20):
+        """Text report of the blocks with the largest total latency"""
+        rows = sorted(self.summary().items(), key=lambda kv: -kv[1]['time'])[:top]
+        lines = [f'{"Block":60}{"Type":>8}{"Count":>10}{"Total ms":>12}{"Mean us":>10}{"Redundant":>11}']
+        for (name, tname), e in rows:
+            lines.append(f'{name:60}{tname:>8}{e["count"]:>10}{e["time"]*1e3:>12.1f}{e["mean"]*1e6:>10.1f}{e["redundant"]:>11}')
+        return '\n'.join(lines)
+
+    def flame(self):
+        """Collapsed stack lines 'command;device;block;type count' for flame graph tools"""
+        with self._lock:
+            return '\n'.join(f'{cmd or "<none>"};{name.rsplit(".", 1)[0]};{name};{tname} {n}'
+                             for (cmd, name, tname), n in sorted(self.counts.items()))
+
+    def dump(self, path):
+        """Write the summary and per command counts to a JSON file"""
+        data = {
+            'blocks':    [dict(block=n, type=t, **e) for (n, t), e in self.summary().items()],
+            'commands':  [dict(command=c, block=n, type=t, count=k) for (c, n, t), k in self.counts.items()],
+            'redundant': [dict(command=c, block=n, count=k) for (c, n), k in self.redundant.items()],
+        }
+        with open(path, 'w') as f:
+            json.dump(data, f, indent=1)
@@ -0,0 +1,226 @@
+#-----------------------------------------------------------------------------
+# This file is part of the 'EPIX HR Firmware'. It is subject to
+# the license terms in the LICENSE.txt file found in the top-level directory
+# of this distribution and at:
+#    https://confluence.slac.stanford.edu/display/ppareg/LICENSE.html.
+# No part of the 'EPIX HR Firmware', including this file, may be
+# copied, modified, propagated, or distributed except according to the terms
+# contained in the LICENSE.txt file.
+#-----------------------------------------------------------------------------
+import rogue.interfaces.memory as rim
+import threading
+import struct
+import queue
+import time
+
+##############################################################
+##
+## Register transaction record and replay
+##
+## TransactionRecorder is a memory slave placed between the
+## devices and the real memory base (srp):
+##    rec = TransactionRecorder(srp, 'initAdcDelay.trc')
+##    self.add(epixHr.AsicDeserHr16bRegisters24St(memBase=rec, ...))
+## Every transaction is forwarded from the caller's thread in
+## issue order, without waiting for it: a pool of forwarding
+## masters (inFlight of them) each has a thread which waits for
+## its transaction, writes it to the trace (time, address,
+## size, type, latency, error flag and data) and completes it.
+## Posted block transactions therefore stay pipelined and the
+## recorded latency is the real one; the caller only blocks
+## when inFlight transactions are already outstanding.
+##
+## TransactionReplay is a memory slave serving a trace without
+## hardware. Reads are served per 32 bit word: every word
+## returns its recorded values in order, whatever block size
+## the recording or the replayed code uses. Writes are checked
+## against the recording. Latency is fixed or the recorded one
+## scaled.
+##
+##############################################################
+
+MAGIC  = b'EPXTRC1\0'
+RECORD = struct.Struct('<dQIBfB')   # time, address, size, type, latency, error
+
+class TransactionRecorder(rim.Slave):
+    def __init__(self, memBase, path, inFlight=16, minAccess=4, maxAccess=4096):
+        super().__init__(minAccess, maxAccess)
+        self._lock    = threading.Lock()
+        self._file    = open(path, 'wb')
+        self._file.write(MAGIC)
+        self._start   = time.perf_counter()
+        self.count    = 0
+
+        # One master, job queue and completion thread per outstanding transaction
+        self._free  = queue.Queue()
+        self._slots = []
+        for i in range(inFlight):
+            master = rim.Master()
+            master._setSlave(memBase)
+            jobs = queue.Queue()
+            thread = threading.Thread(target=self._complete, args=(i, master, jobs), name=f'TransactionRecorder{i}', daemon=True)
+            self._slots.append((master, jobs, thread))
+            thread.start()
+            self._free.put(i)
+
+    def _doTransaction(self, transaction):
+        with transaction.lock():
+            if transaction.expired():
+                return
+            address = transaction.address()
+            size    = transaction.size()
+            type    = transaction.type()
+            data    = bytearray(size)
+            if type in (rim.Write, rim.Post):
+                transaction.getData(data, 0)
+
+        # Issue now, in order, the slot thread waits for it and completes the transaction
+        slot = self._free.get()
+        master, jobs, thread = self._slots[slot]
+        start = time.perf_counter()
+        master._clearError()
+        master._reqTransaction(address, data, size, 0, type)
+        jobs.put((transaction, start, address, size, type, data))
+
+    def _complete(self, slot, master, jobs):
+        while True:
+            job = jobs.get()
+            if job is None:
+                return
+            transaction, start, address, size, type, data = job
+            master._waitTransaction(0)
+            error   = master._getError()
+            latency = time.perf_counter() - start
+            self._free.put(slot)
+
+            with self._lock:
+                if not self._file.closed:
+                    self._file.write(RECORD.pack(start - self._start, address, size, type, latency, 1 if error else 0) + bytes(data))
+                    self.count += 1
+
+            with transaction.lock():
+                if transaction.expired():
+                    continue
+                if error:
+                    transaction.error(error)
+                    continue
+                if type in (rim.Read, rim.Verify):
+                    transaction.setData(data, 0)
+                transaction.done()
+
+    def close(self):
+        """Wait for the outstanding transactions, stop the slot threads and close the trace"""
+        for _ in self._slots:
+            self._free.get()
+        for master, jobs, thread in self._slots:
+            jobs.put(None)
+            thread.join()
+        with self._lock:
+            self._file.close()
+
+    @staticmethod
+    def load(path):
+        """Return the records of a trace: list of dicts with time, address, size, type, latency, error, data"""
+        records = []
+        with open(path, 'rb') as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f'{path}: not a transaction trace')
+            while True:
+                head = f.read(RECORD.size)
+                if len(head) < RECORD.size:
+                    break
+                t, address, size, type, latency, error = RECORD.unpack(head)
+                records.append({'time': t, 'address': address, 'size': size, 'type': type,
+                                'latency': latency, 'error': bool(error), 'data': f.read(size)})
+        # Records are written on completion, return them in issue order
+        records.sort(key=lambda r: r['time'])
+        return records
+
+class TransactionReplay(rim.Slave):
+    def __init__(self, path, latency=0.0, latencyScale=None, minAccess=4, maxAccess=4096):
+        super().__init__(minAccess, maxAccess)
+        self.latency      = latency
+        self.latencyScale = latencyScale
+        self.records      = TransactionRecorder.load(path)
+        self._lock        = threading.Lock()
+        self.reset()
+
+    @staticmethod
+    def _words(address, data):
+        """Split data at address into {32 bit word address: (byte offset in the word, bytes)}"""
+        out = {}
+        for i in range(len(data)):
+            a = address + i
+            word = out.setdefault(a & ~0x3, [a & 0x3, bytearray()])
+            word[1].append(data[i])
+        return out
+
+    def reset(self):
+        """Rewind the recorded read data"""
+        with self._lock:
+            # Per 32 bit word: (byte offset, value, latency) of the recorded reads in order, and the writes
+            self._reads   = {}
+            self._writes  = {}
+            self._memory  = {}
+            self.mismatches = []
+            self.misses   = 0
+            for r in self.records:
+                if r['error']:
+                    continue
+                if r['type'] in (rim.Read, rim.Verify):
+                    for a, (off, b) in self._words(r['address'], r['data']).items():
+                        self._reads.setdefault(a, []).append((off, bytes(b), r['latency']))
+                elif r['type'] in (rim.Write, rim.Post):
+                    for a, (off, b) in self._words(r['address'], r['data']).items():
+                        self._writes.setdefault(a, []).append((off, bytes(b)))
+            for q in list(self._reads.values()) + list(self._writes.values()):
+                q.reverse()
+
+    def _word(self, a):
+        return self._memory.setdefault(a, bytearray(4))
+
+    def _doTransaction(self, transaction):
+        with transaction.lock():
+            if transaction.expired():
+                return
+            address = transaction.address()
+            size    = transaction.size()
+            type    = transaction.type()
+            data    = bytearray(size)
+            if type in (rim.Write, rim.Post):
+                transaction.getData(data, 0)
+
+        latency = None
+        with self._lock:
+            if type in (rim.Write, rim.Post):
+                for a, (off, b) in self._words(address, data).items():
+                    expected = self._writes.get(a)
+                    if expected and expected.pop() != (off, bytes(b)):
+                        self.mismatches.append((a, bytes(b)))
+                    self._word(a)[off:off+len(b)] = b
+            else:
+                # Every word is served from its own recorded reads, whatever block size recorded it,
+                # the last known value (read or written) once they run out
+                pos = 0
+                for a, (off, b) in self._words(address, data).items():
+                    queue = self._reads.get(a)
+                    if queue:
+                        roff, rb, rlat = queue.pop()
+                        self._word(a)[roff:roff+len(rb)] = rb
+                        latency = rlat if latency is None else max(latency, rlat)
+                    else:
+                        self.misses += 1
+                    data[pos:pos+len(b)] = self._word(a)[off:off+len(b)]
+                    pos += len(b)
+
+        if self.latencyScale is not None and latency is not None:
+            time.sleep(latency * self.latencyScale)
+        elif self.latency:
+            time.sleep(self.latency)
+
+        with transaction.lock():
+            if transaction.expired():
+                return
+            if type in (rim.Read, rim.Verify):
+                transaction.setData(data, 0)
+            transaction.done()
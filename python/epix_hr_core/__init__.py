@@ -1,21 +1,58 @@
-from epix_hr_core._AxiVersion                  import *
-from epix_hr_core._SysReg                      import *
-from epix_hr_core._TriggerRegisters            import *
-from epix_hr_core._MonAdcRegisters             import *
-from epix_hr_core._OscilloscopeRegisters       import *
-from epix_hr_core._HighSpeedDacRegisters       import *
-from epix_hr_core._powerSupplyRegisters        import *
-from epix_hr_core._ClockJitterCleanerRegisters import *
-from epix_hr_core._sDacRegisters               import *
-from epix_hr_core._ProgrammablePowerSupply     import *
-from epix_hr_core._ProgrammablePowerSupplyCryo import *
-from epix_hr_core._SlowAdcRegisters            import *
-from epix_hr_core._MicroblazeLog               import *
+import importlib
 
-from epix_hr_core._AsicDeser10bDataRegisters   import *
-from epix_hr_core._AsicDeser14bDataRegisters   import *
+# Public name -> submodule. A submodule (and the surf/rogue packages it pulls in)
+# is only imported on first access of one of its names (PEP 562).
+_modules = {
+    'AxiVersion':                   '_AxiVersion',
+    'CalibratedRailDevice':         '_CalibratedRailDevice',
+    'TraceAccumulator':             '_TraceAccumulator',
+    'NoiseSpectrumAnalyzer':        '_NoiseSpectrumAnalyzer',
+    'SysReg':                       '_SysReg',
+    'TriggerRegisters':             '_TriggerRegisters',
+    'MonAdcRegisters':              '_MonAdcRegisters',
+    'OscilloscopeRegisters':        '_OscilloscopeRegisters',
+    'OscilloscopeReceiver':         '_OscilloscopeReceiver',
+    'HighSpeedDacRegisters':        '_HighSpeedDacRegisters',
+    'DacCharacterization':          '_DacCharacterization',
+    'powerSupplyRegisters':         '_powerSupplyRegisters',
+    'PowerSequencer':               '_PowerSequencer',
+    'ClockJitterCleanerRegisters':  '_ClockJitterCleanerRegisters',
+    'sDacRegisters':                '_sDacRegisters',
+    'ProgrammablePowerSupply':      '_ProgrammablePowerSupply',
+    'ProgrammablePowerSupplyCryo':  '_ProgrammablePowerSupplyCryo',
+    'SlowAdcRegisters':             '_SlowAdcRegisters',
+    'SlowAdcReceiver':              '_SlowAdcReceiver',
+    'EnvironmentArchive':           '_EnvironmentArchive',
+    'AlarmEngine':                  '_AlarmEngine',
+    'MicroblazeLog':                '_MicroblazeLog',
+    'ConfigEngine':                 '_ConfigEngine',
+    'RegisterSnapshot':             '_RegisterSnapshot',
+    'RegisterIndex':                '_RegisterIndex',
+    'TransactionProfiler':          '_TransactionProfiler',
+    'TransactionRecorder':          '_TransactionTrace',
+    'TransactionReplay':            '_TransactionTrace',
+    'MetricsExporter':              '_MetricsExporter',
 
-from epix_hr_core._AsicDeserHr16bRegisters     import *
-from epix_hr_core._AsicDeserHr16bRegisters6St  import *
-from epix_hr_core._AsicDeserHr16bRegisters24St import *
-from epix_hr_core._AsicDeserHr12bRegisters     import *
+    'AsicDeser10bDataRegisters':    '_AsicDeser10bDataRegisters',
+    'AsicDeser14bDataRegisters':    '_AsicDeser14bDataRegisters',
+
+    'AsicDeserHr16bRegisters':      '_AsicDeserHr16bRegisters',
+    'AsicDeserMultiStream':         '_AsicDeserMultiStream',
+    'AsicDeserHr16bRegisters6St':   '_AsicDeserHr16bRegisters6St',
+    'AsicDeserHr16bRegisters24St':  '_AsicDeserHr16bRegisters24St',
+    'LaneWatchdog':                 '_LaneWatchdog',
+    'SweepCheckpoint':              '_SweepCheckpoint',
+    'AsicDeserHr12bRegisters':      '_AsicDeserHr12bRegisters',
+}
+
+__all__ = list(_modules)
+
+def __getattr__(name):
+    if name in _modules:
+        obj = getattr(importlib.import_module(f'{__name__}.{_modules[name]}'), name)
+        globals()[name] = obj
+        return obj
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
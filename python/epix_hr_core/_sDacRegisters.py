@@ -8,6 +8,8 @@
 # contained in the LICENSE.txt file.
 # -----------------------------------------------------------------------------
 import pyrogue as pr
+import numpy as np
+import time
 
 
 class sDacRegisters(pr.Device):
@@ -37,9 +39,27 @@ class sDacRegisters(pr.Device):
                     base=pr.UInt,
                     disp="{:#x}",
                     mode="RW",
+                    overlapEn=True,
                 )
             )
 
+        # All five DAC words as one block, used by the profiles
+        self.add(
+            pr.RemoteVariable(
+                name="dacArray",
+                offset=0x00000,
+                numValues=5,
+                valueBits=16,
+                valueStride=32,
+                base=pr.UInt,
+                mode="RW",
+                overlapEn=True,
+                hidden=True,
+            )
+        )
+
+        self._profiles = {}
+
         # Add Dummy Register
         self.add(
             pr.RemoteVariable(
@@ -72,6 +92,44 @@ class sDacRegisters(pr.Device):
         # A command can also be a call to a local function with local scope.
         # The command object and the arg are passed
 
+    def addProfile(self, name, volts):
+        """Add a named setpoint profile, a vector of five voltages checked together"""
+        volts = np.asarray(volts, dtype=np.float64)
+        if volts.shape != (5,):
+            raise ValueError(f"Profile {name} needs 5 voltages, got shape {volts.shape}")
+        # Range check before the conversion, NaN would otherwise wrap to an arbitrary code
+        bad = ~np.isfinite(volts) | (volts < 0) | (volts > 3.0)
+        if not np.any(bad):
+            codes = (volts * (65536.0 / 3.0)).astype(np.int64)
+            bad = codes > 0xFFFF
+        if np.any(bad):
+            raise ValueError(
+                f"Profile {name}: Vdac {np.flatnonzero(bad).tolist()} outside reference voltage range: 0 V to 2.999 V"
+            )
+        self._profiles[name] = codes.astype(np.uint32)
+
+    def applyProfile(self, name, verify=True):
+        """Write the five DAC words of a profile in one block transaction (one verify read)"""
+        self.dacArray.set(self._profiles[name], write=False)
+        self.writeBlocks(variable=self.dacArray)
+        if verify:
+            self.verifyBlocks(variable=self.dacArray)
+        self.checkBlocks(variable=self.dacArray)
+
+    def scanProfiles(self, names, func=None, dwell=0.0, verify=True):
+        """Apply each profile in turn, calling func(name) after dwell seconds
+
+        Returns the list of func results.
+        """
+        results = []
+        for name in names:
+            self.applyProfile(name, verify=verify)
+            if dwell > 0:
+                time.sleep(dwell)
+            if func is not None:
+                results.append(func(name))
+        return results
+
     def convtFloat(self, var, read):
         intValue = var.dependencies[0].get(read=read)
         return float(intValue) * (3.0 / 65536.0)